@@ -1,6 +1,15 @@
 # clients/admin.py
-from django.contrib import admin
+import shutil
+
+from django.conf import settings
+from django.contrib import admin, messages
+from django.core.paginator import Paginator
+from django.db.models import Count, Sum
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.urls import path
 from .models import ClientProfile, ClientFile
+from .usage import latest_snapshot_day, record_usage_snapshots, tenant_usage, usage_history
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.models import User
 
@@ -17,6 +26,86 @@ admin.site.unregister(User)
 # Register User again with our modified UserAdmin (which now has no inline)
 admin.site.register(User, UserAdmin)
 
-# Keep registering ClientProfile and ClientFile separately
-admin.site.register(ClientProfile)
-admin.site.register(ClientFile)
+
+# Sortable columns of the capacity report -> UsageSnapshot ordering
+CAPACITY_ORDERING = {
+    "name": "client__user__username",
+    "used": "-used_bytes",
+    "files": "-file_count",
+    "growth": "-growth",
+}
+CAPACITY_PAGE_SIZE = 50
+
+
+@admin.register(ClientProfile)
+class ClientProfileAdmin(admin.ModelAdmin):
+    # Usage comes from one aggregate query, never used_bytes()/os.walk per row
+    list_display = ("user", "file_count", "used_mb", "quota_gb")
+    search_fields = ("user__username",)
+    change_list_template = "admin/clients/clientprofile/change_list.html"
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related("user").annotate(
+            _file_count=Count("files"), _used_mb=Sum("files__size")
+        )
+
+    @admin.display(description="Files", ordering="_file_count")
+    def file_count(self, obj):
+        return obj._file_count
+
+    @admin.display(description="Used (MB)", ordering="_used_mb")
+    def used_mb(self, obj):
+        return f"{obj._used_mb or 0:.1f}"
+
+    @admin.display(description="Quota (GB)", ordering="quota_limit")
+    def quota_gb(self, obj):
+        return "-" if obj.quota_limit is None else f"{obj.quota_limit / 1024**3:.0f}"
+
+    def get_urls(self):
+        return [
+            path("capacity/", self.admin_site.admin_view(self.capacity_view), name="clients_capacity"),
+        ] + super().get_urls()
+
+    def capacity_view(self, request):
+        if request.method == "POST":
+            count = record_usage_snapshots()
+            messages.success(request, f"Recorded usage for {count} tenant(s).")
+            return redirect("admin:clients_capacity")
+
+        order = request.GET.get("o", "used")
+        if order not in CAPACITY_ORDERING:
+            order = "used"
+        day = latest_snapshot_day()
+        tenants = tenant_usage(day).order_by(CAPACITY_ORDERING[order], "pk") if day else []
+        page = Paginator(tenants, CAPACITY_PAGE_SIZE).get_page(request.GET.get("p"))
+        for row in page.object_list:
+            row.growth_size = abs(row.growth)
+
+        totals = ClientFile.objects.aggregate(files=Count("id"), used_mb=Sum("size"))
+        disk = shutil.disk_usage(settings.USER_DATA_ROOT)
+        history = usage_history()
+        peak = max((total for _, total, _ in history), default=0) or 1
+
+        context = {
+            **self.admin_site.each_context(request),
+            "title": "Storage capacity",
+            "opts": self.model._meta,
+            "snapshot_day": day,
+            "page": page,
+            "order": order,
+            "tenant_count": ClientProfile.objects.count(),
+            "total_files": totals["files"],
+            "total_bytes": int((totals["used_mb"] or 0) * 1024 * 1024),
+            "disk": disk,
+            "disk_used_percent": disk.used * 100 / disk.total if disk.total else 0,
+            "history": [(taken_on, total, files, total * 100 / peak) for taken_on, total, files in history],
+        }
+        return TemplateResponse(request, "admin/clients/capacity.html", context)
+
+
+@admin.register(ClientFile)
+class ClientFileAdmin(admin.ModelAdmin):
+    list_display = ("__str__", "client", "size", "uploaded_at", "hls_status", "quarantined")
+    list_filter = ("hls_status", "quarantined")
+    search_fields = ("name", "relative_path", "client__user__username")
+    list_select_related = ("client__user",)
@@ -0,0 +1,264 @@
+# clients/backup.py
+"""
+Incremental snapshots of the database and USER_DATA_ROOT.
+
+Each snapshot is a directory under BACKUP_ROOT:
+
+    20260101-020000/
+        db.sqlite3       online copy taken with SQLite's backup API
+        manifest.json    {"<username>/<relative_path>": [size, mtime_ns, sha256]}
+        users/<username>/<relative_path>
+
+The file list comes from the ClientFile rows inside the snapshot's own copy
+of the database, so files and metadata always agree. Files whose size,
+mtime and hash match the previous snapshot are hardlinked to it instead of
+copied, so a nightly run only writes what changed.
+"""
+import json
+import os
+import shutil
+import sqlite3
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection, models, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .fileops import clone_file
+from .models import ClientFile, ClientProfile
+
+DB_NAME = "db.sqlite3"
+MANIFEST_NAME = "manifest.json"
+USERS_DIR = "users"
+PARTIAL_SUFFIX = ".partial"
+
+
+class BackupError(Exception):
+    pass
+
+
+def _live_database():
+    """The raw sqlite3 connection Django is using for the default database."""
+    if connection.vendor != "sqlite":
+        raise BackupError("Snapshots only support the SQLite database backend.")
+    if connection.in_atomic_block:
+        # The backup API would wait forever on our own open transaction
+        raise BackupError("Snapshots cannot be taken or restored inside a transaction.")
+    connection.ensure_connection()
+    return connection.connection
+
+
+def list_snapshots():
+    if not os.path.isdir(settings.BACKUP_ROOT):
+        return []
+    return sorted(
+        name for name in os.listdir(settings.BACKUP_ROOT)
+        if not name.endswith(PARTIAL_SUFFIX) and os.path.isfile(os.path.join(settings.BACKUP_ROOT, name, MANIFEST_NAME))
+    )
+
+
+def snapshot_path(name):
+    path = os.path.join(settings.BACKUP_ROOT, name)
+    if name not in list_snapshots():
+        raise BackupError(f"No such snapshot: {name}")
+    return path
+
+
+def _backup_database(destination_path):
+    """Consistent online copy of the live database (other requests keep going)."""
+    destination = sqlite3.connect(destination_path)
+    try:
+        _live_database().backup(destination)
+    finally:
+        destination.close()
+
+
+def _restore_database(source_path):
+    source = sqlite3.connect(f"file:{source_path}?mode=ro", uri=True)
+    try:
+        source.backup(_live_database())
+    finally:
+        source.close()
+
+
+def _snapshot_files(db_path, username=None):
+    """Yield (username, storage_path, relative_path, row) from a snapshot database."""
+    files = ClientFile._meta.db_table
+    profiles = ClientProfile._meta.db_table
+    users = User._meta.db_table
+    query = (
+        f"SELECT u.username, p.storage_path, f.* FROM {files} f "
+        f"JOIN {profiles} p ON p.id = f.client_id JOIN {users} u ON u.id = p.user_id "
+        "WHERE f.quarantined = 0"
+    )
+    params = []
+    if username:
+        query += " AND u.username = ?"
+        params.append(username)
+
+    db = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    db.row_factory = sqlite3.Row
+    try:
+        for row in db.execute(query + " ORDER BY f.id", params):
+            yield row["username"], row["storage_path"], row["relative_path"] or row["name"], row
+    finally:
+        db.close()
+
+
+def _model_kwargs(model, row, exclude=()):
+    """Turn a raw sqlite3 row from a snapshot into field values for `model`."""
+    kwargs = {}
+    for field in model._meta.concrete_fields:
+        if field.attname in exclude or field.column not in row.keys():
+            continue
+        value = row[field.column]
+        if isinstance(field, models.DateTimeField) and value is not None:
+            # Stored as naive UTC text by the SQLite backend
+            value = parse_datetime(value)
+            if settings.USE_TZ and timezone.is_naive(value):
+                value = timezone.make_aware(value, dt_timezone.utc)
+        kwargs[field.attname] = value
+    return kwargs
+
+
+def create_snapshot(log=print):
+    """Take a new snapshot and return its name."""
+    name = datetime.now().strftime("%Y%m%d-%H%M%S")
+    os.makedirs(settings.BACKUP_ROOT, exist_ok=True)
+    work_dir = os.path.join(settings.BACKUP_ROOT, name + PARTIAL_SUFFIX)
+    if os.path.exists(work_dir):
+        shutil.rmtree(work_dir)
+    os.makedirs(work_dir)
+
+    snapshots = list_snapshots()
+    previous = snapshots[-1] if snapshots else None
+    previous_dir = os.path.join(settings.BACKUP_ROOT, previous) if previous else None
+    previous_manifest = {}
+    if previous_dir:
+        with open(os.path.join(previous_dir, MANIFEST_NAME)) as f:
+            previous_manifest = json.load(f)
+
+    db_copy = os.path.join(work_dir, DB_NAME)
+    _backup_database(db_copy)
+
+    manifest = {}
+    copied = linked = missing = 0
+    for username, storage_path, relative_path, row in _snapshot_files(db_copy):
+        key = f"{username}/{relative_path}"
+        if key in manifest:
+            # Duplicate rows for one path: the file is already in. Linking or
+            # copying again could write through a hardlink into the previous snapshot
+            continue
+        source = os.path.join(storage_path, relative_path)
+        try:
+            stat = os.stat(source)
+        except FileNotFoundError:
+            # Deleted after the database copy was taken
+            missing += 1
+            continue
+
+        entry = [stat.st_size, stat.st_mtime_ns, row["sha256"]]
+        destination = os.path.join(work_dir, USERS_DIR, key)
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+
+        if previous_manifest.get(key) == entry:
+            try:
+                os.link(os.path.join(previous_dir, USERS_DIR, key), destination)
+                linked += 1
+                manifest[key] = entry
+                continue
+            except OSError:
+                pass  # previous copy gone or on another filesystem: copy instead
+        clone_file(source, destination)
+        copied += 1
+        manifest[key] = entry
+
+    with open(os.path.join(work_dir, MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f)
+    os.rename(work_dir, os.path.join(settings.BACKUP_ROOT, name))
+    log(f"Snapshot {name}: {copied} copied, {linked} unchanged (hardlinked), {missing} missing.")
+    return name
+
+
+def prune_snapshots(keep, log=print):
+    """Delete all but the newest `keep` snapshots."""
+    for name in list_snapshots()[:-keep] if keep else []:
+        shutil.rmtree(os.path.join(settings.BACKUP_ROOT, name))
+        log(f"Pruned snapshot {name}")
+
+
+def _restore_tree(snapshot_dir, username, storage_path):
+    source_root = os.path.join(snapshot_dir, USERS_DIR, username)
+    if os.path.isdir(storage_path):
+        shutil.rmtree(storage_path)
+    os.makedirs(storage_path, exist_ok=True)
+    if not os.path.isdir(source_root):
+        return
+    for root, dirs, files in os.walk(source_root):
+        target_root = os.path.join(storage_path, os.path.relpath(root, source_root))
+        os.makedirs(target_root, exist_ok=True)
+        for f in files:
+            # Never hardlink back: in-place overwrites would corrupt the snapshot
+            clone_file(os.path.join(root, f), os.path.join(target_root, f))
+
+
+def restore_instance(name, log=print):
+    """Replace the whole database and every user folder with snapshot `name`."""
+    snapshot_dir = snapshot_path(name)
+    db_copy = os.path.join(snapshot_dir, DB_NAME)
+
+    _restore_database(db_copy)
+
+    for username, storage_path in {(u, p) for u, p, _, _ in _snapshot_files(db_copy)}:
+        _restore_tree(snapshot_dir, username, storage_path)
+        log(f"Restored files for {username}")
+
+
+def restore_user(name, username, log=print):
+    """Restore one user's files and ClientFile rows from snapshot `name`."""
+    snapshot_dir = snapshot_path(name)
+    db_copy = os.path.join(snapshot_dir, DB_NAME)
+
+    db = sqlite3.connect(f"file:{db_copy}?mode=ro", uri=True)
+    db.row_factory = sqlite3.Row
+    try:
+        user_row = db.execute(
+            f"SELECT * FROM {User._meta.db_table} WHERE username = ?", [username]
+        ).fetchone()
+        profile_row = user_row and db.execute(
+            f"SELECT * FROM {ClientProfile._meta.db_table} WHERE user_id = ?", [user_row["id"]]
+        ).fetchone()
+    finally:
+        db.close()
+    if profile_row is None:
+        raise BackupError(f"User {username} is not in snapshot {name}")
+
+    with transaction.atomic():
+        user = User.objects.filter(username=username).first()
+        if user is None:
+            user = User(**_model_kwargs(User, user_row, exclude=("id",)))
+            user.save()  # post_save creates the ClientProfile
+        profile = ClientProfile.objects.get(user=user)
+        profile.quota_limit = profile_row["quota_limit"]
+        profile.save(update_fields=["quota_limit"])
+
+        profile.files.all().delete()
+        restored = []
+        for _, _, _, row in _snapshot_files(db_copy, username):
+            client_file = ClientFile(**_model_kwargs(ClientFile, row, exclude=("client_id",)))
+            client_file.client = profile
+            if client_file.hls_status == ClientFile.HLS_READY:
+                # Renditions were removed with the old rows; package again
+                client_file.hls_status = ClientFile.HLS_PENDING
+            restored.append(client_file)
+        uploaded_at = [f.uploaded_at for f in restored]
+        ClientFile.objects.bulk_create(restored)
+        # bulk_create stamps auto_now_add fields; put the original times back
+        for client_file, when in zip(restored, uploaded_at):
+            client_file.uploaded_at = when
+        ClientFile.objects.bulk_update(restored, ["uploaded_at"], batch_size=500)
+
+    _restore_tree(snapshot_dir, username, profile.storage_path)
+    log(f"Restored {len(restored)} file(s) for {username} from {name}")
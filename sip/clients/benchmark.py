@@ -0,0 +1,217 @@
+# clients/benchmark.py
+"""
+Synthetic-tenant benchmarks for the clients app hot paths.
+
+Everything runs against a throwaway SQLite file and USER_DATA_ROOT created
+by the `benchmark` management command; see that command for the options.
+"""
+import io
+import math
+import os
+import random
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client
+from django.urls import reverse
+
+from .models import ClientFile, ClientProfile
+
+BLOCK = os.urandom(64 * 1024)
+
+
+def write_file(path, size):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        remaining = size
+        while remaining > 0:
+            f.write(BLOCK[:min(remaining, len(BLOCK))])
+            remaining -= len(BLOCK)
+
+
+def random_size(rng, min_size, max_size):
+    """Log-uniform between min_size and max_size: many small files, a few big ones."""
+    return int(math.exp(rng.uniform(math.log(min_size), math.log(max_size))))
+
+
+def random_folder(rng, depth, fanout):
+    levels = rng.randint(0, depth)
+    return "/".join(f"dir{rng.randrange(fanout)}" for _ in range(levels))
+
+
+def create_tenants(tenants, files_per_tenant, depth, fanout, min_size, max_size, seed=0):
+    """Create users, profiles, files on disk and ClientFile rows. Returns the profiles."""
+    rng = random.Random(seed)
+    profiles = []
+    for t in range(tenants):
+        user = User.objects.create_user(f"bench{t:05d}", password="bench")
+        profile = ClientProfile.objects.get(user=user)
+        rows = []
+        for i in range(files_per_tenant):
+            folder = random_folder(rng, depth, fanout)
+            relative_path = f"{folder}/file{i:06d}.bin" if folder else f"file{i:06d}.bin"
+            size = random_size(rng, min_size, max_size)
+            write_file(os.path.join(profile.storage_path, relative_path), size)
+            rows.append(ClientFile(
+                client=profile, name=os.path.basename(relative_path),
+                relative_path=relative_path, size=size / (1024 * 1024),
+            ))
+        ClientFile.objects.bulk_create(rows, batch_size=500)
+        profiles.append(profile)
+    return profiles
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(durations, peak_bytes, transferred=0):
+    ordered = sorted(durations)
+    result = {
+        "iterations": len(ordered),
+        "mean_ms": sum(ordered) / len(ordered) * 1000,
+        "p50_ms": percentile(ordered, 50) * 1000,
+        "p90_ms": percentile(ordered, 90) * 1000,
+        "p99_ms": percentile(ordered, 99) * 1000,
+        "max_ms": ordered[-1] * 1000,
+        "peak_memory_kb": peak_bytes / 1024,
+    }
+    if transferred:
+        result["throughput_mb_s"] = transferred / (1024 * 1024) / sum(ordered)
+    return result
+
+
+def run_scenario(action, iterations, setup=None):
+    """
+    Time `action` `iterations` times, then run it once more under tracemalloc
+    for peak memory (kept out of the timings because tracing slows Python).
+    `setup` runs untimed before every call and its result is passed in.
+    action returns the number of bytes it transferred (or None).
+    """
+    durations = []
+    transferred = 0
+    sink = io.StringIO()
+    for _ in range(iterations):
+        arg = setup() if setup else None
+        with redirect_stdout(sink):  # upload_file prints debug lines
+            start = time.perf_counter()
+            moved = action(arg)
+            durations.append(time.perf_counter() - start)
+        transferred += moved or 0
+        sink.seek(0)
+        sink.truncate()
+
+    arg = setup() if setup else None
+    tracemalloc.start()
+    try:
+        with redirect_stdout(sink):
+            action(arg)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return summarize(durations, peak, transferred)
+
+
+def check(response, *expected):
+    if response.status_code not in expected:
+        raise RuntimeError(f"{response.request['PATH_INFO']} returned {response.status_code}")
+    return response
+
+
+def run_benchmarks(profile, iterations, small_files, small_size, large_files, large_size, log=print):
+    client = Client()
+    client.force_login(profile.user)
+    top_folder = (
+        profile.files.filter(relative_path__contains="/")
+        .values_list("relative_path", flat=True).first() or ""
+    ).split("/")[0]
+    largest = profile.files.order_by("-size").first()
+    results = {}
+
+    def dashboard(_):
+        check(client.get(reverse("dashboard")), 200)
+
+    def folder_view(_):
+        check(client.get(reverse("folder_view", args=[top_folder])), 200)
+
+    counter = {"upload": 0}
+
+    def upload_batch(count, size):
+        """(action, setup) pair posting `count` files of `size` bytes in one request."""
+        def make():
+            counter["upload"] += 1
+            n = counter["upload"]
+            files = [SimpleUploadedFile(f"up{n}-{i}.bin", BLOCK[:1] * size) for i in range(count)]
+            return files, [f"uploads{n}/{f.name}" for f in files]
+
+        def upload(batch):
+            files, paths = batch
+            check(client.post(reverse("upload"), {"files": files, "file_paths[]": paths}), 302)
+            return count * size
+        return upload, make
+
+    def download(_):
+        response = check(client.get(reverse("download", args=[largest.relative_path])), 200)
+        return sum(len(chunk) for chunk in response.streaming_content)
+
+    def make_folder():
+        counter["upload"] += 1
+        name = f"doomed{counter['upload']}"
+        rows = []
+        for i in range(100):
+            relative_path = f"{name}/sub{i % 5}/f{i}.bin"
+            write_file(os.path.join(profile.storage_path, relative_path), 4096)
+            rows.append(ClientFile(client=profile, name=f"f{i}.bin", relative_path=relative_path, size=4096 / (1024 * 1024)))
+        ClientFile.objects.bulk_create(rows)
+        return name
+
+    def delete_folder(name):
+        check(client.get(reverse("delete_folder", args=[name])), 302)
+
+    def used_bytes(_):
+        profile.used_bytes()
+
+    scenarios = [
+        ("dashboard", dashboard, None),
+        ("folder_view", folder_view, None),
+        ("upload_small_files", *upload_batch(small_files, small_size)),
+        ("upload_large_files", *upload_batch(large_files, large_size)),
+        ("download_file", download, None),
+        ("delete_folder", delete_folder, make_folder),
+        ("used_bytes", used_bytes, None),
+    ]
+    for name, action, setup in scenarios:
+        if name == "folder_view" and not top_folder:
+            continue
+        if name == "download_file" and largest is None:
+            continue
+        results[name] = run_scenario(action, iterations, setup)
+        log(format_result(name, results[name]))
+    return results
+
+
+def format_result(name, r):
+    line = (
+        f"{name:<20} p50 {r['p50_ms']:9.2f} ms  p90 {r['p90_ms']:9.2f} ms  "
+        f"p99 {r['p99_ms']:9.2f} ms  peak {r['peak_memory_kb']:9.0f} KB"
+    )
+    if "throughput_mb_s" in r:
+        line += f"  {r['throughput_mb_s']:8.1f} MB/s"
+    return line
+
+
+def compare(previous, current, log=print):
+    """Print p50 change per scenario between two result documents."""
+    for name, result in current["results"].items():
+        before = previous.get("results", {}).get(name)
+        if not before or not before["p50_ms"]:
+            continue
+        change = (result["p50_ms"] - before["p50_ms"]) / before["p50_ms"] * 100
+        log(f"{name:<20} p50 {before['p50_ms']:9.2f} -> {result['p50_ms']:9.2f} ms ({change:+.1f}%)")
@@ -0,0 +1,213 @@
+# clients/fileops.py
+import errno
+import fcntl
+import os
+import shutil
+
+from django.db import transaction
+from django.db.models import Q, Sum, Value
+from django.db.models.functions import Concat, Substr
+from django.db.models.lookups import Exact
+
+from .metadata import METADATA_FIELDS
+from .models import ClientFile
+
+# Linux FICLONE ioctl: share extents with the source (btrfs, xfs, bcachefs...)
+FICLONE = 0x40049409
+
+COPY_BATCH_SIZE = 500
+
+
+class FileOperationError(Exception):
+    pass
+
+
+def clean_relative_path(path):
+    """Normalize a user-supplied path, rejecting traversal and absolute paths."""
+    path = os.path.normpath((path or "").strip().strip("/"))
+    if not path or path == "." or path.startswith("..") or os.path.isabs(path) or "\0" in path:
+        raise FileOperationError(f"Invalid path: {path}")
+    return path
+
+
+def _file_q(path):
+    # Rows uploaded before relative_path existed only have a name
+    return Q(relative_path=path) | Q(relative_path="", name=path)
+
+
+def _folder_q(path):
+    # relative_path__startswith is a LIKE on SQLite, which ignores case and
+    # would let "Photos" match rows under "photos/" as well
+    prefix = path + "/"
+    return Q(Exact(Substr("relative_path", 1, len(prefix)), prefix))
+
+
+def _resolve(client_profile, path):
+    """Return ("file", row) or ("folder", queryset) for path, or raise."""
+    client_file = client_profile.files.filter(_file_q(path)).first()
+    if client_file is not None:
+        return "file", client_file
+    folder_files = client_profile.files.filter(_folder_q(path))
+    if folder_files.exists():
+        return "folder", folder_files
+    raise FileOperationError(f"'{path}' does not exist.")
+
+
+def _check_destination(client_profile, source, destination):
+    if destination == source:
+        raise FileOperationError("Source and destination are the same.")
+    if destination.startswith(source + "/"):
+        raise FileOperationError("A folder cannot be moved or copied into itself.")
+    taken = client_profile.files.filter(
+        _file_q(destination) | _folder_q(destination)
+    ).exists()
+    if taken or os.path.lexists(os.path.join(client_profile.storage_path, destination)):
+        raise FileOperationError(f"'{destination}' already exists.")
+
+
+def move(client_profile, source, destination):
+    """
+    Move or rename a file or folder. This is one rename() on disk plus one
+    UPDATE in the database, however many files the folder holds.
+    """
+    source = clean_relative_path(source)
+    destination = clean_relative_path(destination)
+    kind, target = _resolve(client_profile, source)
+    _check_destination(client_profile, source, destination)
+
+    source_path = os.path.join(client_profile.storage_path, source)
+    destination_path = os.path.join(client_profile.storage_path, destination)
+    os.makedirs(os.path.dirname(destination_path), exist_ok=True)
+    os.rename(source_path, destination_path)
+
+    try:
+        with transaction.atomic():
+            if kind == "file":
+                target.relative_path = destination
+                target.name = os.path.basename(destination)
+                target.save(update_fields=["relative_path", "name"])
+            else:
+                # Substr is 1-based: keep everything after "source/"
+                target.update(relative_path=Concat(
+                    Value(destination + "/"), Substr("relative_path", len(source) + 2)
+                ))
+    except Exception:
+        os.rename(destination_path, source_path)
+        raise
+    return kind
+
+
+def _reflink(src, dst):
+    try:
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+    except OSError:
+        return False
+    return True
+
+
+def _copy_file_range(src, dst):
+    """Copy src to dst in the kernel. Returns False if unsupported here."""
+    if not hasattr(os, "copy_file_range"):  # not available on macOS
+        return False
+    remaining = os.fstat(src.fileno()).st_size
+    try:
+        while remaining > 0:
+            copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+            if copied == 0:
+                break
+            remaining -= copied
+    except OSError as e:
+        if e.errno in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP):
+            return False
+        raise
+    return True
+
+
+def clone_file(source_path, destination_path):
+    """
+    Copy a file as cheaply as the filesystem allows: a reflink (shared
+    extents, no data written), then copy_file_range (in-kernel copy), then a
+    plain userspace copy. Hardlinks are not used because uploads overwrite
+    files in place, which would silently change every linked copy.
+    """
+    with open(source_path, "rb") as src, open(destination_path, "wb") as dst:
+        if not _reflink(src, dst) and not _copy_file_range(src, dst):
+            src.seek(0)
+            dst.seek(0)
+            dst.truncate()
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+    shutil.copystat(source_path, destination_path)
+
+
+def _copy_row(client_file, relative_path):
+    duplicate = ClientFile(
+        client_id=client_file.client_id,
+        name=os.path.basename(relative_path),
+        relative_path=relative_path,
+        size=client_file.size,
+        sha256=client_file.sha256,
+        verified_at=client_file.verified_at,
+    )
+    for field in METADATA_FIELDS:
+        setattr(duplicate, field, getattr(client_file, field))
+    if duplicate.is_video:
+        # Renditions are stored per row, so the copy gets packaged on its own
+        duplicate.hls_status = ClientFile.HLS_PENDING
+    return duplicate
+
+
+def copy(client_profile, source, destination):
+    """
+    Copy a file or folder. Quota is charged for the full logical size even
+    when the filesystem shares extents. Folders are copied in batches so
+    large trees never hold every row in memory. Quarantined files and rows
+    whose file is missing are left out; if anything else fails, the partial
+    copy is removed again.
+    """
+    source = clean_relative_path(source)
+    destination = clean_relative_path(destination)
+    kind, target = _resolve(client_profile, source)
+    _check_destination(client_profile, source, destination)
+
+    if kind == "file":
+        if target.quarantined:
+            raise FileOperationError(f"'{source}' is quarantined and cannot be copied.")
+        if not os.path.isfile(os.path.join(client_profile.storage_path, source)):
+            raise FileOperationError(f"'{source}' is missing on disk.")
+        rows = [target]
+        copy_bytes = target.size * 1024 * 1024
+    else:
+        target = target.filter(quarantined=False)
+        rows = target.order_by("pk").iterator(chunk_size=COPY_BATCH_SIZE)
+        copy_bytes = (target.aggregate(total=Sum("size"))["total"] or 0) * 1024 * 1024
+    if client_profile.quota_limit is not None and client_profile.used_bytes() + copy_bytes > client_profile.quota_limit:
+        raise FileOperationError("Copy would exceed your storage quota!")
+
+    storage = client_profile.storage_path
+    try:
+        batch = []
+        for client_file in rows:
+            old_path = client_file.relative_path or client_file.name
+            if not os.path.isfile(os.path.join(storage, old_path)):
+                continue
+            new_path = destination if kind == "file" else destination + old_path[len(source):]
+            destination_path = os.path.join(storage, new_path)
+            os.makedirs(os.path.dirname(destination_path), exist_ok=True)
+            clone_file(os.path.join(storage, old_path), destination_path)
+            batch.append(_copy_row(client_file, new_path))
+            if len(batch) >= COPY_BATCH_SIZE:
+                ClientFile.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            ClientFile.objects.bulk_create(batch)
+    except Exception:
+        # _check_destination made sure nothing lived there before, so
+        # everything at the destination is ours to remove
+        client_profile.files.filter(_file_q(destination) | _folder_q(destination)).delete()
+        destination_path = os.path.join(storage, destination)
+        if os.path.isdir(destination_path):
+            shutil.rmtree(destination_path)
+        elif os.path.lexists(destination_path):
+            os.remove(destination_path)
+        raise
+    return kind
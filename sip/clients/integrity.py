@@ -0,0 +1,67 @@
+# clients/integrity.py
+import base64
+import hashlib
+import os
+import time
+
+from django.utils import timezone
+
+from .models import ClientFile
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(path, bytes_per_second=None):
+    """
+    SHA-256 of a file. With bytes_per_second set, reads are paced to that rate
+    and dropped from the page cache afterwards, so a background scrub does not
+    compete with foreground requests for the disk or evict their cached data.
+    """
+    hasher = hashlib.sha256()
+    started = time.monotonic()
+    read = 0
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            hasher.update(chunk)
+            read += len(chunk)
+            if bytes_per_second:
+                ahead = read / bytes_per_second - (time.monotonic() - started)
+                if ahead > 0:
+                    time.sleep(ahead)
+        if bytes_per_second and hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+    return hasher.hexdigest()
+
+
+def digest_headers(sha256_hex):
+    """ETag plus RFC 9530 Content-Digest and legacy RFC 3230 Digest for a stored hash."""
+    b64 = base64.b64encode(bytes.fromhex(sha256_hex)).decode()
+    return {
+        "ETag": f'"{sha256_hex}"',
+        "Content-Digest": f"sha-256=:{b64}:",
+        "Digest": f"SHA-256={b64}",
+    }
+
+
+def quarantine(client_file):
+    """
+    Flag a corrupted file's row and move the file out of the client's folder.
+    Returns the new location, or None if the row's sha256 changed since it
+    was read: the file was re-uploaded meanwhile and the new copy is good.
+    """
+    flagged = ClientFile.objects.filter(
+        pk=client_file.pk, sha256=client_file.sha256, quarantined=False
+    ).update(quarantined=True, verified_at=timezone.now())
+    if not flagged:
+        return None
+
+    source = client_file.full_path
+    destination = client_file.quarantine_path
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    if os.path.exists(destination):
+        destination += f".{int(time.time())}"
+    os.rename(source, destination)
+    return destination
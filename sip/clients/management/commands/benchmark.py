@@ -0,0 +1,116 @@
+# clients/management/commands/benchmark.py
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from clients.benchmark import compare, create_tenants, run_benchmarks
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark dashboard, folder_view, upload_file, download_file, delete_folder and "
+        "used_bytes against synthetic tenants. Runs on a throwaway database and data "
+        "directory, never the real ones, and writes the results as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tenants", type=int, default=5)
+        parser.add_argument("--files", type=int, default=500, help="Files per tenant.")
+        parser.add_argument("--depth", type=int, default=3, help="Maximum folder depth.")
+        parser.add_argument("--fanout", type=int, default=4, help="Subfolders per folder level.")
+        parser.add_argument("--min-size", type=int, default=1024, help="Smallest synthetic file in bytes.")
+        parser.add_argument("--max-size", type=int, default=4 * 1024 * 1024, help="Largest synthetic file in bytes.")
+        parser.add_argument("--iterations", type=int, default=20, help="Timed runs per scenario.")
+        parser.add_argument("--small-files", type=int, default=50, help="Files per small-file upload request.")
+        parser.add_argument("--small-size", type=int, default=4 * 1024)
+        parser.add_argument("--large-files", type=int, default=2, help="Files per large-file upload request.")
+        parser.add_argument("--large-size", type=int, default=32 * 1024 * 1024)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--output", default="benchmark-results.json")
+        parser.add_argument("--compare", metavar="FILE", help="Earlier results file to compare against.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("The benchmark runs on a throwaway SQLite file; other backends are not supported.")
+        if options["min_size"] < 1 or options["max_size"] < options["min_size"]:
+            raise CommandError("--min-size must be >= 1 and <= --max-size.")
+
+        with tempfile.TemporaryDirectory(prefix="sip-bench-") as root:
+            paths = {
+                name: os.path.join(root, name)
+                for name in ("userdata", "hls", "quarantine", "backups")
+            }
+            connection.settings_dict.setdefault("TEST", {})["NAME"] = os.path.join(root, "bench.sqlite3")
+            setup_test_environment()
+            old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+            try:
+                with override_settings(
+                    DEBUG=False,
+                    USER_DATA_ROOT=paths["userdata"],
+                    HLS_ROOT=paths["hls"],
+                    QUARANTINE_ROOT=paths["quarantine"],
+                    BACKUP_ROOT=paths["backups"],
+                ):
+                    results = self.run(options)
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+                teardown_test_environment()
+
+        with open(options["output"], "w") as f:
+            json.dump(results, f, indent=2, default=str)
+        self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+
+        if options["compare"]:
+            with open(options["compare"]) as f:
+                compare(json.load(f), results, log=self.stdout.write)
+
+    def run(self, options):
+        self.stdout.write(
+            f"Creating {options['tenants']} tenant(s) x {options['files']} file(s)..."
+        )
+        started = time.perf_counter()
+        profiles = create_tenants(
+            options["tenants"], options["files"], options["depth"], options["fanout"],
+            options["min_size"], options["max_size"], seed=options["seed"],
+        )
+        self.stdout.write(f"Generated in {time.perf_counter() - started:.1f}s")
+
+        results = run_benchmarks(
+            profiles[0], options["iterations"],
+            options["small_files"], options["small_size"],
+            options["large_files"], options["large_size"],
+            log=self.stdout.write,
+        )
+        scale_keys = (
+            "tenants", "files", "depth", "fanout", "min_size", "max_size", "iterations",
+            "small_files", "small_size", "large_files", "large_size", "seed",
+        )
+        return {
+            "meta": {
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "git_commit": self.git_commit(),
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "platform": platform.platform(),
+                "scale": {key: options[key] for key in scale_keys},
+            },
+            "results": results,
+        }
+
+    def git_commit(self):
+        try:
+            return subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"],
+                capture_output=True, text=True, check=True, cwd=settings.BASE_DIR,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
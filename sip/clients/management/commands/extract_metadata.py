@@ -0,0 +1,67 @@
+# clients/management/commands/extract_metadata.py
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from clients.metadata import METADATA_FIELDS, extract_metadata
+from clients.models import ClientFile
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill in EXIF, duration and page-count columns for new uploads (run with "
+        "--watch as a worker) or backfill files uploaded before extraction existed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", help="Only process files belonging to this username.")
+        parser.add_argument(
+            "--force", action="store_true",
+            help="Re-extract files that already have metadata.",
+        )
+        parser.add_argument("--batch-size", type=int, default=200)
+        parser.add_argument(
+            "--watch", type=int, metavar="SECONDS", default=0,
+            help="Keep running, polling for new uploads every SECONDS.",
+        )
+
+    def handle(self, *args, **options):
+        done = self.extract(options, force=options["force"])
+        while options["watch"]:
+            time.sleep(options["watch"])
+            done += self.extract(options, force=False)
+
+        self.stdout.write(self.style.SUCCESS(f"Extracted metadata for {done} file(s)."))
+
+    def extract(self, options, force):
+        files = ClientFile.objects.select_related("client").order_by("pk")
+        if options["user"]:
+            files = files.filter(client__user__username=options["user"])
+        if not force:
+            files = files.filter(metadata_extracted=False)
+
+        batch = []
+        done = 0
+        for client_file in files.iterator(chunk_size=options["batch_size"]):
+            batch.append(extract_metadata(client_file))
+            if len(batch) >= options["batch_size"]:
+                done += self.save(batch)
+                batch = []
+                self.stdout.write(f"{done} file(s) processed...")
+        if batch:
+            done += self.save(batch)
+        return done
+
+    def save(self, batch):
+        """
+        Write back only rows whose sha256 is unchanged: a file re-uploaded
+        while the batch was being read has had its metadata reset and must
+        not be marked extracted with the old file's values.
+        """
+        saved = 0
+        with transaction.atomic():
+            for client_file in batch:
+                values = {field: getattr(client_file, field) for field in METADATA_FIELDS}
+                saved += ClientFile.objects.filter(pk=client_file.pk, sha256=client_file.sha256).update(**values)
+        return saved
@@ -0,0 +1,82 @@
+# clients/management/commands/package_hls.py
+import os
+import shutil
+import time
+
+from django.core.management.base import BaseCommand
+
+from clients.media import MediaToolError, package_hls
+from clients.models import ClientFile, video_files_q
+
+
+class Command(BaseCommand):
+    help = "Package pending video uploads into multi-bitrate HLS renditions using ffmpeg."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all", action="store_true",
+            help="Also queue existing videos that were never packaged (one-off backfill).",
+        )
+        parser.add_argument(
+            "--retry-failed", action="store_true",
+            help="Re-queue videos whose previous packaging attempt failed.",
+        )
+        parser.add_argument(
+            "--watch", type=int, metavar="SECONDS", default=0,
+            help="Keep running, polling for new uploads every SECONDS.",
+        )
+        parser.add_argument("--limit", type=int, default=0, help="Stop after packaging this many files.")
+
+    def handle(self, *args, **options):
+        videos = ClientFile.objects.filter(video_files_q())
+        if options["all"]:
+            videos.filter(hls_status=ClientFile.HLS_NONE).update(hls_status=ClientFile.HLS_PENDING)
+        if options["retry_failed"]:
+            videos.filter(hls_status=ClientFile.HLS_FAILED).update(hls_status=ClientFile.HLS_PENDING)
+
+        done = 0
+        while True:
+            pending = (
+                ClientFile.objects.filter(hls_status=ClientFile.HLS_PENDING)
+                .select_related("client")
+                .order_by("uploaded_at")
+            )
+            for client_file in pending.iterator():
+                self.package(client_file)
+                done += 1
+                if options["limit"] and done >= options["limit"]:
+                    return
+            if not options["watch"]:
+                break
+            time.sleep(options["watch"])
+
+        self.stdout.write(self.style.SUCCESS(f"Packaged {done} video(s)."))
+
+    def package(self, client_file):
+        try:
+            package_hls(client_file.full_path, client_file.hls_dir)
+        except (MediaToolError, OSError) as e:
+            # OSError: HLS_ROOT unwritable or full. Mark it failed so the worker
+            # does not crash on the same row every run; --retry-failed re-queues it
+            self.stderr.write(f"{client_file}: {e}")
+            status = ClientFile.HLS_FAILED
+        else:
+            self.stdout.write(f"Packaged {client_file}")
+            status = ClientFile.HLS_READY
+        # The row may have been deleted or re-uploaded (new hls_version) while
+        # ffmpeg was running; then these renditions are for content that is gone
+        if not ClientFile.objects.filter(pk=client_file.pk, hls_version=client_file.hls_version).update(hls_status=status):
+            shutil.rmtree(client_file.hls_dir, ignore_errors=True)
+        elif status == ClientFile.HLS_READY:
+            self.remove_old_versions(client_file)
+
+    def remove_old_versions(self, client_file):
+        """Drop renditions of earlier content (and the pre-versioning layout)."""
+        current = str(client_file.hls_version)
+        for entry in os.scandir(client_file.hls_base_dir):
+            if entry.name == current or entry.name.startswith(".hls-"):
+                continue  # keep in-progress work directories
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path, ignore_errors=True)
+            else:
+                os.remove(entry.path)
@@ -0,0 +1,12 @@
+# clients/management/commands/record_usage.py
+from django.core.management.base import BaseCommand
+
+from clients.usage import record_usage_snapshots
+
+
+class Command(BaseCommand):
+    help = "Record today's per-tenant usage snapshot for the admin capacity report (run daily)."
+
+    def handle(self, *args, **options):
+        count = record_usage_snapshots()
+        self.stdout.write(self.style.SUCCESS(f"Recorded usage for {count} tenant(s)."))
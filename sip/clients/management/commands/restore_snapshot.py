@@ -0,0 +1,33 @@
+# clients/management/commands/restore_snapshot.py
+from django.core.management.base import BaseCommand, CommandError
+
+from clients.backup import BackupError, list_snapshots, restore_instance, restore_user
+
+
+class Command(BaseCommand):
+    help = (
+        "Restore from a snapshot. With --user only that user's files and records are "
+        "restored while the site keeps running; without it the whole database and "
+        "USER_DATA_ROOT are replaced, so stop the web server first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("snapshot", help="Snapshot name, or 'latest'.")
+        parser.add_argument("--user", help="Restore only this username.")
+
+    def handle(self, *args, **options):
+        name = options["snapshot"]
+        if name == "latest":
+            snapshots = list_snapshots()
+            if not snapshots:
+                raise CommandError("There are no snapshots yet.")
+            name = snapshots[-1]
+
+        try:
+            if options["user"]:
+                restore_user(name, options["user"], log=self.stdout.write)
+            else:
+                restore_instance(name, log=self.stdout.write)
+        except BackupError as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(f"Restored from {name}."))
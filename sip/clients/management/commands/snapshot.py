@@ -0,0 +1,28 @@
+# clients/management/commands/snapshot.py
+from django.core.management.base import BaseCommand, CommandError
+
+from clients.backup import BackupError, create_snapshot, list_snapshots, prune_snapshots
+
+
+class Command(BaseCommand):
+    help = (
+        "Take an online, incremental snapshot of the database and all user files "
+        "into BACKUP_ROOT. Unchanged files are hardlinked to the previous snapshot."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--keep", type=int, default=0, help="Afterwards, delete all but the newest KEEP snapshots.")
+        parser.add_argument("--list", action="store_true", help="List existing snapshots and exit.")
+
+    def handle(self, *args, **options):
+        if options["list"]:
+            for name in list_snapshots():
+                self.stdout.write(name)
+            return
+
+        try:
+            name = create_snapshot(log=self.stdout.write)
+        except BackupError as e:
+            raise CommandError(str(e))
+        prune_snapshots(options["keep"], log=self.stdout.write)
+        self.stdout.write(self.style.SUCCESS(f"Snapshot {name} complete."))
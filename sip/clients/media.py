@@ -0,0 +1,98 @@
+# clients/media.py
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+
+from django.conf import settings
+
+
+class MediaToolError(Exception):
+    pass
+
+
+def probe(path):
+    """Run ffprobe on a file and return its parsed JSON (format + streams)."""
+    cmd = [
+        settings.FFPROBE_BINARY, "-v", "error",
+        "-print_format", "json", "-show_format", "-show_streams",
+        path,
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, check=True, timeout=settings.FFPROBE_TIMEOUT_SECONDS)
+    except (OSError, subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
+        raise MediaToolError(f"ffprobe failed for {path}: {e}")
+    return json.loads(result.stdout or b"{}")
+
+
+def _renditions_for(height):
+    ladder = [r for r in settings.HLS_RENDITIONS if height is None or r[0] <= height]
+    # Always keep at least the smallest rendition, even for tiny sources
+    return ladder or settings.HLS_RENDITIONS[:1]
+
+
+def package_hls(source_path, output_dir):
+    """
+    Transcode source_path into multi-bitrate HLS under output_dir:
+
+        output_dir/master.m3u8
+        output_dir/v0/index.m3u8, v0/seg_00000.ts, ...
+
+    Output is written to a temporary directory on the same disk and renamed
+    into place once ffmpeg succeeds, so a half-written rendition is never served.
+    """
+    info = probe(source_path)
+    streams = info.get("streams", [])
+    video = next((s for s in streams if s.get("codec_type") == "video"), None)
+    if video is None:
+        raise MediaToolError(f"No video stream in {source_path}")
+    has_audio = any(s.get("codec_type") == "audio" for s in streams)
+    renditions = _renditions_for(video.get("height"))
+
+    parent = os.path.dirname(os.path.normpath(output_dir))
+    os.makedirs(parent, exist_ok=True)
+    work_dir = tempfile.mkdtemp(prefix=".hls-", dir=parent)
+
+    split = f"[0:v]split={len(renditions)}" + "".join(f"[v{i}]" for i in range(len(renditions)))
+    scales = [f"[v{i}]scale=-2:{h}[v{i}out]" for i, (h, _, _) in enumerate(renditions)]
+
+    cmd = [
+        settings.FFMPEG_BINARY, "-y", "-v", "error", "-i", source_path,
+        "-filter_complex", ";".join([split] + scales),
+    ]
+    stream_map = []
+    for i, (height, v_bitrate, a_bitrate) in enumerate(renditions):
+        cmd += [
+            "-map", f"[v{i}out]",
+            f"-c:v:{i}", "libx264", "-preset", "veryfast", f"-b:v:{i}", v_bitrate,
+            f"-maxrate:v:{i}", v_bitrate, f"-bufsize:v:{i}", v_bitrate,
+        ]
+        if has_audio:
+            cmd += ["-map", "0:a:0", f"-c:a:{i}", "aac", f"-b:a:{i}", a_bitrate]
+            stream_map.append(f"v:{i},a:{i}")
+        else:
+            stream_map.append(f"v:{i}")
+
+    seconds = settings.HLS_SEGMENT_SECONDS
+    cmd += [
+        # Keyframes on segment boundaries so players can switch renditions cleanly
+        "-force_key_frames", f"expr:gte(t,n_forced*{seconds})",
+        "-f", "hls",
+        "-hls_time", str(seconds),
+        "-hls_playlist_type", "vod",
+        "-hls_segment_filename", os.path.join(work_dir, "v%v", "seg_%05d.ts"),
+        "-master_pl_name", "master.m3u8",
+        "-var_stream_map", " ".join(stream_map),
+        os.path.join(work_dir, "v%v", "index.m3u8"),
+    ]
+
+    try:
+        subprocess.run(cmd, capture_output=True, check=True)
+        if os.path.isdir(output_dir):
+            shutil.rmtree(output_dir)
+        os.rename(work_dir, output_dir)
+    except (OSError, subprocess.CalledProcessError) as e:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        stderr = getattr(e, "stderr", b"") or b""
+        raise MediaToolError(f"ffmpeg failed for {source_path}: {e} {stderr.decode(errors='replace')[-500:]}")
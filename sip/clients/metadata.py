@@ -0,0 +1,118 @@
+# clients/metadata.py
+from datetime import datetime
+
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .media import MediaToolError, probe
+
+METADATA_FIELDS = ["metadata_extracted", "taken_at", "width", "height", "camera", "duration", "page_count"]
+
+# EXIF tag ids (see the EXIF 2.3 spec)
+EXIF_MAKE = 271
+EXIF_MODEL = 272
+EXIF_DATETIME = 306
+EXIF_IFD = 0x8769
+EXIF_DATETIME_ORIGINAL = 36867
+
+
+def _parse_exif_datetime(value):
+    try:
+        taken = datetime.strptime(str(value).strip("\x00 "), "%Y:%m:%d %H:%M:%S")
+    except ValueError:
+        return None
+    # EXIF carries no timezone; interpret it in the project's TIME_ZONE
+    return timezone.make_aware(taken)
+
+
+def _image_metadata(path):
+    try:
+        from PIL import Image
+    except ImportError:
+        return {}
+
+    try:
+        with Image.open(path) as img:
+            width, height = img.size
+            exif = img.getexif()
+            taken = exif.get_ifd(EXIF_IFD).get(EXIF_DATETIME_ORIGINAL) or exif.get(EXIF_DATETIME)
+            make = str(exif.get(EXIF_MAKE, "")).strip("\x00 ")
+            model = str(exif.get(EXIF_MODEL, "")).strip("\x00 ")
+    except Exception:
+        return {}
+
+    # Most cameras repeat the make in the model ("Canon" / "Canon EOS 80D")
+    camera = model if model.startswith(make) else f"{make} {model}".strip()
+    return {
+        "width": width,
+        "height": height,
+        "taken_at": _parse_exif_datetime(taken) if taken else None,
+        "camera": camera[:128],
+    }
+
+
+def _av_metadata(path):
+    try:
+        info = probe(path)
+    except MediaToolError:
+        return {}
+
+    fmt = info.get("format", {})
+    data = {}
+    try:
+        data["duration"] = float(fmt["duration"])
+    except (KeyError, ValueError):
+        pass
+
+    video = next((s for s in info.get("streams", []) if s.get("codec_type") == "video"), None)
+    if video:
+        data["width"] = video.get("width")
+        data["height"] = video.get("height")
+
+    created = fmt.get("tags", {}).get("creation_time")
+    if created:
+        try:
+            taken = parse_datetime(created)
+        except ValueError:
+            # Well-formed but impossible, e.g. "0000-00-00T00:00:00Z"
+            taken = None
+        if taken and timezone.is_naive(taken):
+            taken = timezone.make_aware(taken)
+        data["taken_at"] = taken
+    return data
+
+
+def _pdf_metadata(path):
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        return {}
+
+    try:
+        return {"page_count": len(PdfReader(path).pages)}
+    except Exception:
+        return {}
+
+
+def extract_metadata(client_file):
+    """
+    Read EXIF/duration/page count for client_file from disk and set them on
+    the instance (without saving). Missing tools or unreadable files just
+    leave the columns empty; the row is still marked as extracted so the
+    backfill does not retry it forever.
+    """
+    path = client_file.full_path
+    if client_file.is_image:
+        data = _image_metadata(path)
+    elif client_file.is_video or client_file.is_audio:
+        data = _av_metadata(path)
+    elif client_file.is_pdf:
+        data = _pdf_metadata(path)
+    else:
+        data = {}
+
+    for field, value in data.items():
+        if value is not None:
+            setattr(client_file, field, value)
+    client_file.metadata_extracted = True
+    return client_file
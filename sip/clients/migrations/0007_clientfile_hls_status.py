@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 19:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0006_clientfile_relative_path'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='clientfile',
+            name='hls_status',
+            field=models.CharField(blank=True, choices=[('', 'Not packaged'), ('pending', 'Pending'), ('ready', 'Ready'), ('failed', 'Failed')], db_index=True, default='', max_length=10),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.7 on 2026-10-19 19:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0007_clientfile_hls_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='clientfile',
+            name='camera',
+            field=models.CharField(blank=True, max_length=128),
+        ),
+        migrations.AddField(
+            model_name='clientfile',
+            name='duration',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='clientfile',
+            name='height',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='clientfile',
+            name='metadata_extracted',
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+        migrations.AddField(
+            model_name='clientfile',
+            name='page_count',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='clientfile',
+            name='taken_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='clientfile',
+            name='width',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='clientfile',
+            index=models.Index(fields=['client', 'taken_at'], name='clients_cli_client__75b694_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='clientfile',
+            index=models.Index(fields=['client', 'duration'], name='clients_cli_client__ecbd8b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='clientfile',
+            index=models.Index(fields=['client', 'camera'], name='clients_cli_client__f19c6c_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 19:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0008_clientfile_media_metadata'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='clientprofile',
+            name='share_version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
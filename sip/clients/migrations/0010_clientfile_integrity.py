@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-19 19:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0009_clientprofile_share_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='clientfile',
+            name='quarantined',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='clientfile',
+            name='sha256',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='clientfile',
+            name='verified_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='clientfile',
+            index=models.Index(fields=['client', 'relative_path'], name='clients_cli_client__2ee097_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2026-10-19 19:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0010_clientfile_integrity'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UsageSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('taken_on', models.DateField(db_index=True)),
+                ('used_bytes', models.BigIntegerField()),
+                ('file_count', models.PositiveIntegerField()),
+                ('image_count', models.PositiveIntegerField(default=0)),
+                ('video_count', models.PositiveIntegerField(default=0)),
+                ('audio_count', models.PositiveIntegerField(default=0)),
+                ('pdf_count', models.PositiveIntegerField(default=0)),
+                ('client', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='usage_snapshots', to='clients.clientprofile')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('client', 'taken_on'), name='unique_usage_snapshot_per_day')],
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.7 on 2026-10-19 21:05
+
+from django.db import migrations, models
+
+
+def requeue_packaged_videos(apps, schema_editor):
+    # Renditions used to live directly in HLS_ROOT/<pk>/; package them again
+    # into the versioned layout (package_hls clears the old files afterwards)
+    ClientFile = apps.get_model('clients', 'ClientFile')
+    ClientFile.objects.filter(hls_status='ready').update(hls_status='pending')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0011_usagesnapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='clientfile',
+            name='hls_version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.RunPython(requeue_packaged_videos, migrations.RunPython.noop),
+    ]
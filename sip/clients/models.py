@@ -1,12 +1,34 @@
 # clients/models.py
 import os
+import shutil
 from django.contrib.auth.models import User
 from django.db import models
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.conf import settings
 
 
+IMAGE_EXTENSIONS = [".png", ".jpg", ".jpeg", ".gif", ".webp"]
+VIDEO_EXTENSIONS = [".mp4", ".mov", ".webm", ".ogg", ".avi", ".mkv"]
+AUDIO_EXTENSIONS = [".mp3", ".wav", ".ogg", ".m4a", ".flac"]
+
+
+def extension_q(extensions, prefix=""):
+    """
+    Q object matching ClientFile rows whose name ends in one of `extensions`.
+    Pass prefix="files__" to filter ClientProfile rows through the relation.
+    """
+    q = models.Q()
+    for ext in extensions:
+        q |= models.Q(**{f"{prefix}name__iendswith": ext})
+    return q
+
+
+def video_files_q():
+    """Q object matching ClientFile rows that `is_video` would accept."""
+    return extension_q(VIDEO_EXTENSIONS)
+
+
 class ClientProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     storage_path = models.CharField(max_length=255, unique=True)
@@ -14,6 +36,8 @@ class ClientProfile(models.Model):
         null=True, blank=True,
         help_text="Storage quota in bytes. Example: 5*1024*1024*1024 for 5GB"
     )
+    # Baked into every share link; bumping it revokes all of this client's links
+    share_version = models.PositiveIntegerField(default=1)
 
     def __str__(self):
         return self.user.username
@@ -36,11 +60,51 @@ class ClientProfile(models.Model):
 
 
 class ClientFile(models.Model):
+    HLS_NONE = ""
+    HLS_PENDING = "pending"
+    HLS_READY = "ready"
+    HLS_FAILED = "failed"
+    HLS_STATUS_CHOICES = [
+        (HLS_NONE, "Not packaged"),
+        (HLS_PENDING, "Pending"),
+        (HLS_READY, "Ready"),
+        (HLS_FAILED, "Failed"),
+    ]
+
     client = models.ForeignKey("ClientProfile", on_delete=models.CASCADE, related_name="files")
     name = models.CharField(max_length=255)          # e.g., "logo.png"
     relative_path = models.CharField(max_length=512, blank=True)  # e.g., "project/design/logo.png"
     size = models.FloatField()  # in MB
     uploaded_at = models.DateTimeField(auto_now_add=True)
+    hls_status = models.CharField(
+        max_length=10, blank=True, default=HLS_NONE, choices=HLS_STATUS_CHOICES, db_index=True
+    )
+    # Bumped whenever the file's content is replaced; part of every HLS URL so
+    # browsers that cached the old renditions (they are immutable) refetch
+    hls_version = models.PositiveIntegerField(default=1)
+
+    # Media metadata, filled in after upload by the extract_metadata worker
+    # so listings can sort/filter without file I/O
+    metadata_extracted = models.BooleanField(default=False, db_index=True)
+    taken_at = models.DateTimeField(null=True, blank=True)    # EXIF capture time / video creation time
+    width = models.PositiveIntegerField(null=True, blank=True)
+    height = models.PositiveIntegerField(null=True, blank=True)
+    camera = models.CharField(max_length=128, blank=True)     # e.g., "Apple iPhone 13"
+    duration = models.FloatField(null=True, blank=True)       # in seconds (audio/video)
+    page_count = models.PositiveIntegerField(null=True, blank=True)
+
+    # Integrity: hashed while streaming the upload, re-checked by scrub_files
+    sha256 = models.CharField(max_length=64, blank=True)
+    verified_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    quarantined = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["client", "relative_path"]),
+            models.Index(fields=["client", "taken_at"]),
+            models.Index(fields=["client", "duration"]),
+            models.Index(fields=["client", "camera"]),
+        ]
 
     @property
     def extension(self):
@@ -48,20 +112,50 @@ class ClientFile(models.Model):
 
     @property
     def is_image(self):
-        return self.extension in [".png", ".jpg", ".jpeg", ".gif", ".webp"]
+        return self.extension in IMAGE_EXTENSIONS
 
     @property
     def is_video(self):
-        return self.extension in [".mp4", ".mov", ".webm", ".ogg", ".avi", ".mkv"]
+        return self.extension in VIDEO_EXTENSIONS
 
     @property
     def is_audio(self):
-        return self.extension in [".mp3", ".wav", ".ogg", ".m4a", ".flac"]
+        return self.extension in AUDIO_EXTENSIONS
 
     @property
     def is_pdf(self):
         return self.extension == ".pdf"
 
+    @property
+    def full_path(self):
+        return os.path.join(self.client.storage_path, self.relative_path or self.name)
+
+    @property
+    def quarantine_path(self):
+        return os.path.join(settings.QUARANTINE_ROOT, str(self.client_id), self.relative_path or self.name)
+
+    @property
+    def hls_ready(self):
+        return self.hls_status == self.HLS_READY
+
+    @property
+    def hls_base_dir(self):
+        return os.path.join(settings.HLS_ROOT, str(self.pk))
+
+    @property
+    def hls_dir(self):
+        return os.path.join(self.hls_base_dir, str(self.hls_version))
+
+    @property
+    def duration_display(self):
+        if self.duration is None:
+            return ""
+        minutes, seconds = divmod(int(self.duration), 60)
+        hours, minutes = divmod(minutes, 60)
+        if hours:
+            return f"{hours}:{minutes:02d}:{seconds:02d}"
+        return f"{minutes}:{seconds:02d}"
+
     @property
     def folder_name(self):
         if '/' in self.relative_path:
@@ -72,6 +166,30 @@ class ClientFile(models.Model):
         return self.relative_path or self.name
 
 
+class UsageSnapshot(models.Model):
+    """Per-tenant usage totals, recorded daily by `manage.py record_usage`."""
+    client = models.ForeignKey("ClientProfile", on_delete=models.CASCADE, related_name="usage_snapshots")
+    taken_on = models.DateField(db_index=True)
+    used_bytes = models.BigIntegerField()
+    file_count = models.PositiveIntegerField()
+    image_count = models.PositiveIntegerField(default=0)
+    video_count = models.PositiveIntegerField(default=0)
+    audio_count = models.PositiveIntegerField(default=0)
+    pdf_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["client", "taken_on"], name="unique_usage_snapshot_per_day"),
+        ]
+
+    def __str__(self):
+        return f"{self.client} on {self.taken_on}"
+
+    @property
+    def other_count(self):
+        return self.file_count - self.image_count - self.video_count - self.audio_count - self.pdf_count
+
+
 @receiver(post_save, sender=User)
 def create_client_profile(sender, instance, created, **kwargs):
     if created:
@@ -82,4 +200,10 @@ def create_client_profile(sender, instance, created, **kwargs):
                 user=instance,
                 storage_path=user_folder,
                 quota_limit=5 * 1024**3  # 5 GB
-            )
\ No newline at end of file
+            )
+
+
+@receiver(post_delete, sender=ClientFile)
+def remove_client_file_renditions(sender, instance, **kwargs):
+    if os.path.isdir(instance.hls_base_dir):
+        shutil.rmtree(instance.hls_base_dir, ignore_errors=True)
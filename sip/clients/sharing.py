@@ -0,0 +1,99 @@
+# clients/sharing.py
+import secrets
+import time
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import caches
+
+from .models import ClientProfile
+
+SHARE_SALT = "clients.share"
+
+
+class ShareLinkError(Exception):
+    def __init__(self, message, status=404):
+        super().__init__(message)
+        self.status = status
+
+
+def _cache():
+    return caches[settings.SHARE_LINK_CACHE]
+
+
+def _owner_key(user_id):
+    return f"share-owner:{user_id}"
+
+
+def owner_info(user_id):
+    """
+    (storage_path, share_version) for a link owner. Served from the cache so a
+    busy public link does not hit the database on every request.
+    """
+    info = _cache().get(_owner_key(user_id))
+    if info is None:
+        row = ClientProfile.objects.filter(user_id=user_id).values_list("storage_path", "share_version").first()
+        if row is None:
+            raise ShareLinkError("Link owner no longer exists.")
+        info = tuple(row)
+        _cache().set(_owner_key(user_id), info, settings.SHARE_LINK_OWNER_CACHE_SECONDS)
+    return info
+
+
+def make_token(client_profile, path, days, max_downloads=None, max_bytes=None):
+    """Sign a share link for `path` (file or folder, relative to the client's storage)."""
+    days = max(1, min(int(days), settings.SHARE_LINK_MAX_DAYS))
+    payload = {
+        "u": client_profile.user_id,
+        "p": path,
+        "e": int(time.time()) + days * 86400,
+        "v": client_profile.share_version,
+        "i": secrets.token_urlsafe(6),  # per-link id for the cap counters
+    }
+    if max_downloads:
+        payload["n"] = int(max_downloads)
+    if max_bytes:
+        payload["b"] = int(max_bytes)
+    return signing.dumps(payload, salt=SHARE_SALT, compress=True)
+
+
+def read_token(token):
+    """Verify signature, expiry and key version; return (payload, storage_path)."""
+    try:
+        payload = signing.loads(token, salt=SHARE_SALT)
+    except signing.BadSignature:
+        raise ShareLinkError("Invalid link.")
+    if payload["e"] < time.time():
+        raise ShareLinkError("This link has expired.", status=410)
+
+    storage_path, share_version = owner_info(payload["u"])
+    if payload["v"] != share_version:
+        raise ShareLinkError("This link has been revoked.", status=410)
+    return payload, storage_path
+
+
+def _count(key, amount, timeout):
+    share_cache = _cache()
+    share_cache.add(key, 0, timeout)
+    try:
+        return share_cache.incr(key, amount)
+    except ValueError:
+        # Evicted between add() and incr(): start the count again
+        share_cache.set(key, amount, timeout)
+        return amount
+
+
+def charge_download(payload, size):
+    """Count one download of `size` bytes against the link's caps, if any."""
+    timeout = max(1, payload["e"] - int(time.time()))
+    if "n" in payload and _count(f"share-count:{payload['i']}", 1, timeout) > payload["n"]:
+        raise ShareLinkError("This link has reached its download limit.", status=410)
+    if "b" in payload and _count(f"share-bytes:{payload['i']}", size, timeout) > payload["b"]:
+        raise ShareLinkError("This link has reached its bandwidth limit.", status=410)
+
+
+def revoke_all(client_profile):
+    """Invalidate every share link this client has handed out."""
+    client_profile.share_version += 1
+    client_profile.save(update_fields=["share_version"])
+    _cache().delete(_owner_key(client_profile.user_id))
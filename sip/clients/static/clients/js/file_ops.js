@@ -0,0 +1,57 @@
+// Move / rename / copy run on the server; nothing is re-uploaded.
+function submitFileOp(action, source, destination) {
+  if (!destination || destination === source) return;
+  const form = document.getElementById('file-op-form');
+  form.action = action;
+  form.source.value = source;
+  form.destination.value = destination.replace(/^\/+|\/+$/g, '');
+  form.submit();
+}
+
+function splitPath(path) {
+  const i = path.lastIndexOf('/');
+  return i === -1 ? ['', path] : [path.slice(0, i), path.slice(i + 1)];
+}
+
+function renameItem(path) {
+  const [parent, name] = splitPath(path);
+  const newName = prompt('New name:', name);
+  if (newName) submitFileOp(document.body.dataset.moveUrl, path, parent ? parent + '/' + newName : newName);
+}
+
+function moveItem(path) {
+  const [parent, name] = splitPath(path);
+  const folder = prompt('Move to folder (leave empty for the top level):', parent);
+  if (folder !== null) submitFileOp(document.body.dataset.moveUrl, path, folder ? folder.replace(/\/+$/, '') + '/' + name : name);
+}
+
+function copyItem(path) {
+  const [parent, name] = splitPath(path);
+  const dot = name.lastIndexOf('.');
+  const suggestion = dot > 0 ? name.slice(0, dot) + ' (copy)' + name.slice(dot) : name + ' (copy)';
+  const destination = prompt('Copy to:', parent ? parent + '/' + suggestion : suggestion);
+  if (destination) submitFileOp(document.body.dataset.copyUrl, path, destination);
+}
+
+function shareItem(path) {
+  const days = prompt('Share link valid for how many days?', '7');
+  if (!days) return;
+  const maxDownloads = prompt('Maximum number of downloads (leave empty for no limit):', '');
+  if (maxDownloads === null) return;
+  const maxMb = prompt('Maximum total download size in MB (leave empty for no limit):', '');
+  if (maxMb === null) return;
+  const data = new FormData(document.getElementById('file-op-form'));
+  data.set('path', path);
+  data.set('days', days);
+  data.set('max_downloads', maxDownloads);
+  data.set('max_mb', maxMb);
+  fetch(document.body.dataset.shareUrl, { method: 'POST', body: data })
+    .then(response => response.json())
+    .then(result => {
+      if (result.status === 'success') {
+        prompt('Anyone with this link can download it:', result.url);
+      } else {
+        alert('Could not create link: ' + result.message);
+      }
+    });
+}
@@ -0,0 +1,25 @@
+// Videos with packaged HLS renditions switch bitrate by bandwidth;
+// anything not packaged yet keeps playing the original file.
+window.addEventListener('DOMContentLoaded', () => {
+  document.querySelectorAll('video[data-hls]').forEach(video => {
+    const src = video.dataset.hls;
+    if (video.canPlayType('application/vnd.apple.mpegurl')) {
+      // Playlist gone (e.g. after a restore): drop src so the <source> plays
+      video.addEventListener('error', () => {
+        video.removeAttribute('src');
+        video.load();
+      }, { once: true });
+      video.src = src;
+    } else if (window.Hls && Hls.isSupported()) {
+      const hls = new Hls();
+      hls.on(Hls.Events.ERROR, (event, data) => {
+        if (data.fatal) {
+          hls.destroy();
+          video.load();  // fall back to the original <source>
+        }
+      });
+      hls.loadSource(src);
+      hls.attachMedia(video);
+    }
+  });
+});
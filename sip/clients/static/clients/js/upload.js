@@ -0,0 +1,123 @@
+const dropArea = document.getElementById('drop-area');
+const fileInput = document.getElementById('fileElem');
+const folderInput = document.getElementById('folderElem');
+const progressBar = document.getElementById('upload-progress');
+const progressFill = document.querySelector('.progress-fill');
+const progressText = document.getElementById('progress-text');
+
+function preventDefaults(e) {
+  e.preventDefault();
+  e.stopPropagation();
+}
+
+['dragenter', 'dragover', 'dragleave', 'drop'].forEach(eventName => {
+  dropArea.addEventListener(eventName, preventDefaults, false);
+  document.body.addEventListener(eventName, preventDefaults, false);
+});
+
+['dragenter', 'dragover'].forEach(eventName => {
+  dropArea.addEventListener(eventName, () => dropArea.classList.add('drag-over'), false);
+});
+
+['dragleave', 'drop'].forEach(eventName => {
+  dropArea.addEventListener(eventName, () => dropArea.classList.remove('drag-over'), false);
+});
+
+dropArea.addEventListener('drop', handleDrop, false);
+fileInput.addEventListener('change', handleFileSelect, false);
+folderInput.addEventListener('change', handleFileSelect, false);
+
+function handleDrop(e) {
+  const items = e.dataTransfer.items;
+
+  if (items) {
+    processItems(items).then(fileList => {
+      uploadFiles(fileList);
+    });
+  } else {
+    const dt = e.dataTransfer;
+    uploadFiles(dt.files);
+  }
+}
+
+async function processItems(items) {
+  const files = [];
+  const queue = [];
+
+  for (let i = 0; i < items.length; i++) {
+    const item = items[i];
+    if (item.kind === 'file') {
+      const entry = item.webkitGetAsEntry();
+      queue.push(entry);
+    }
+  }
+
+  while (queue.length > 0) {
+    const entry = queue.shift();
+
+    if (entry.isFile) {
+      const file = await new Promise(resolve => entry.file(resolve));
+      file.fullPath = entry.fullPath.substring(1);
+      files.push(file);
+    } else if (entry.isDirectory) {
+      const reader = entry.createReader();
+      const entries = await new Promise(resolve => reader.readEntries(resolve));
+      queue.push(...entries);
+    }
+  }
+
+  return files;
+}
+
+function handleFileSelect(e) {
+  const files = e.target.files;
+  uploadFiles(files);
+}
+
+function uploadFiles(fileList) {
+  if (fileList.length === 0) return;
+
+  const formData = new FormData();
+  const filesArray = Array.from(fileList);
+
+  const csrfToken = document.querySelector('[name=csrfmiddlewaretoken]').value;
+  formData.append('csrfmiddlewaretoken', csrfToken);
+
+  filesArray.forEach((file, index) => {
+    const relativePath = file.fullPath || file.webkitRelativePath || file.name;
+    formData.append('file_paths[]', relativePath);
+    formData.append('files', file);
+  });
+
+  progressBar.style.display = 'block';
+  progressFill.style.width = '0%';
+  progressText.textContent = 'Starting upload...';
+
+  const xhr = new XMLHttpRequest();
+
+  xhr.upload.onprogress = function(e) {
+    if (e.lengthComputable) {
+      const percentComplete = (e.loaded / e.total) * 100;
+      progressFill.style.width = percentComplete + '%';
+      progressText.textContent = `Uploading... ${Math.round(percentComplete)}%`;
+    }
+  };
+
+  xhr.onload = function() {
+    if (xhr.status === 200) {
+      progressText.textContent = '✅ Upload complete! Reloading...';
+      setTimeout(() => location.reload(), 800);
+    } else {
+      progressText.textContent = '❌ Upload failed. Please try again.';
+      progressFill.style.backgroundColor = '#EF4444';
+    }
+  };
+
+  xhr.onerror = function() {
+    progressText.textContent = '❌ Network error.';
+    progressFill.style.backgroundColor = '#EF4444';
+  };
+
+  xhr.open('POST', document.body.dataset.uploadUrl, true);
+  xhr.send(formData);
+}
@@ -1,3 +1,747 @@
-from django.test import TestCase
+import hashlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import date, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from . import admin as clients_admin, backup, fileops, sharing
+from .metadata import extract_metadata
+from .models import ClientFile, ClientProfile, UsageSnapshot
+from .usage import record_usage_snapshots, tenant_usage
+from .views import apply_listing_options
+
+
+class StorageMixin:
+    """Runs each test against throwaway USER_DATA_ROOT/HLS/quarantine/backup folders."""
+
+    def setUp(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root, ignore_errors=True)
+        storage_settings = override_settings(
+            USER_DATA_ROOT=os.path.join(root, "user_data"),
+            HLS_ROOT=os.path.join(root, "hls"),
+            QUARANTINE_ROOT=os.path.join(root, "quarantine"),
+            BACKUP_ROOT=os.path.join(root, "backups"),
+        )
+        storage_settings.enable()
+        self.addCleanup(storage_settings.disable)
+
+        self.user = User.objects.create_user("ada", password="secret")
+        self.profile = ClientProfile.objects.get(user=self.user)
+
+    def add_file(self, relative_path, content=b"hello"):
+        path = os.path.join(self.profile.storage_path, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(content)
+        return ClientFile.objects.create(
+            client=self.profile,
+            name=os.path.basename(relative_path),
+            relative_path=relative_path,
+            size=len(content) / (1024 * 1024),
+            sha256=hashlib.sha256(content).hexdigest(),
+        )
+
+    def stored_paths(self):
+        return sorted(self.profile.files.values_list("relative_path", flat=True))
+
+    def exists(self, relative_path):
+        return os.path.isfile(os.path.join(self.profile.storage_path, relative_path))
+
+
+class StorageTestCase(StorageMixin, TestCase):
+    pass
+
+
+class FileOperationTests(StorageTestCase):
+    def test_move_folder_rewrites_every_row_under_it(self):
+        self.add_file("Photos/a.jpg")
+        self.add_file("Photos/2024/b.jpg")
+        self.add_file("Photoshop/c.psd")
+
+        fileops.move(self.profile, "Photos", "Pics")
+
+        self.assertEqual(self.stored_paths(), ["Photoshop/c.psd", "Pics/2024/b.jpg", "Pics/a.jpg"])
+        self.assertTrue(self.exists("Pics/2024/b.jpg"))
+        self.assertFalse(os.path.exists(os.path.join(self.profile.storage_path, "Photos")))
+
+    def test_move_folder_prefix_is_case_sensitive(self):
+        self.add_file("Photos/a.jpg")
+        if self.exists("photos/a.jpg"):
+            self.skipTest("case-insensitive filesystem")
+        self.add_file("photos/b.jpg")
+
+        fileops.move(self.profile, "Photos", "Pics")
+
+        self.assertEqual(self.stored_paths(), ["Pics/a.jpg", "photos/b.jpg"])
+        self.assertTrue(self.exists("photos/b.jpg"))
+
+    def test_rename_file(self):
+        self.add_file("notes/todo.txt")
+
+        fileops.move(self.profile, "notes/todo.txt", "notes/done.txt")
+
+        client_file = self.profile.files.get()
+        self.assertEqual((client_file.relative_path, client_file.name), ("notes/done.txt", "done.txt"))
+        self.assertTrue(self.exists("notes/done.txt"))
+
+    def test_move_refuses_existing_destination(self):
+        self.add_file("a.txt")
+        self.add_file("b.txt")
+
+        with self.assertRaises(fileops.FileOperationError):
+            fileops.move(self.profile, "a.txt", "b.txt")
+
+    def test_copy_folder(self):
+        self.add_file("src/one.txt", b"one")
+        self.add_file("src/deep/two.txt", b"two")
+
+        fileops.copy(self.profile, "src", "dst")
+
+        self.assertEqual(
+            self.stored_paths(), ["dst/deep/two.txt", "dst/one.txt", "src/deep/two.txt", "src/one.txt"]
+        )
+        with open(os.path.join(self.profile.storage_path, "dst/deep/two.txt"), "rb") as f:
+            self.assertEqual(f.read(), b"two")
+
+    def test_copy_into_itself_is_refused(self):
+        self.add_file("src/one.txt")
+
+        with self.assertRaises(fileops.FileOperationError):
+            fileops.copy(self.profile, "src", "src/inner")
+        self.assertEqual(self.stored_paths(), ["src/one.txt"])
+
+    def test_copy_over_quota_is_refused(self):
+        self.add_file("src/one.txt", b"x" * 1024)
+        self.profile.quota_limit = 1500
+        self.profile.save()
+
+        with self.assertRaises(fileops.FileOperationError):
+            fileops.copy(self.profile, "src", "dst")
+        self.assertFalse(os.path.exists(os.path.join(self.profile.storage_path, "dst")))
+
+    def test_copy_skips_missing_files(self):
+        self.add_file("src/one.txt")
+        self.add_file("src/gone.txt")
+        os.remove(os.path.join(self.profile.storage_path, "src/gone.txt"))
+
+        fileops.copy(self.profile, "src", "dst")
+
+        self.assertEqual(self.profile.files.filter(relative_path__startswith="dst/").count(), 1)
+        self.assertTrue(self.exists("dst/one.txt"))
+
+    def test_copy_of_missing_file_is_an_error(self):
+        self.add_file("gone.txt")
+        os.remove(os.path.join(self.profile.storage_path, "gone.txt"))
+
+        with self.assertRaises(fileops.FileOperationError):
+            fileops.copy(self.profile, "gone.txt", "copy.txt")
+        self.assertEqual(self.stored_paths(), ["gone.txt"])
+
+    def test_failed_copy_is_cleaned_up(self):
+        self.add_file("src/one.txt")
+        self.add_file("src/two.txt")
+        real_clone = fileops.clone_file
+        calls = []
+
+        def flaky_clone(source_path, destination_path):
+            calls.append(source_path)
+            if len(calls) == 2:
+                raise OSError("disk full")
+            real_clone(source_path, destination_path)
+
+        with mock.patch.object(fileops, "clone_file", flaky_clone):
+            with self.assertRaises(OSError):
+                fileops.copy(self.profile, "src", "dst")
+
+        self.assertEqual(self.stored_paths(), ["src/one.txt", "src/two.txt"])
+        self.assertFalse(os.path.exists(os.path.join(self.profile.storage_path, "dst")))
+        # Nothing left behind, so a retry goes through
+        fileops.copy(self.profile, "src", "dst")
+        self.assertTrue(self.exists("dst/two.txt"))
+
+
+class ShareLinkTests(StorageTestCase):
+    def setUp(self):
+        super().setUp()
+        # Owner info and cap counters live in the share link cache; keep it in memory
+        cache_settings = override_settings(CACHES={
+            "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+            "share_links": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "share-tests"},
+        }, SHARE_LINK_CACHE="share_links")
+        cache_settings.enable()
+        self.addCleanup(cache_settings.disable)
+        caches["share_links"].clear()
+        self.add_file("public/report.txt", b"0123456789")
+        self.add_file("private.txt", b"secret")
+
+    def share(self, path, **limits):
+        self.client.force_login(self.user)
+        response = self.client.post(reverse("create_share_link"), {"path": path, "days": 7, **limits})
+        self.client.logout()
+        return response
+
+    def link_token(self, path, **limits):
+        response = self.share(path, **limits)
+        self.assertEqual(response.status_code, 200)
+        return response.json()["url"].rstrip("/").rsplit("/", 1)[1]
+
+    def get_shared(self, token, subpath=""):
+        if subpath:
+            return self.client.get(reverse("shared_file", args=[token, subpath]))
+        return self.client.get(reverse("shared_link", args=[token]))
+
+    def test_shared_file_downloads(self):
+        token = self.link_token("public/report.txt")
+
+        response = self.get_shared(token)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), b"0123456789")
+
+    def test_tampered_token_is_rejected(self):
+        token = self.link_token("public/report.txt")
+        with override_settings(SECRET_KEY="not-the-real-key"):
+            forged = sharing.make_token(self.profile, "private.txt", 7)
+
+        self.assertEqual(self.get_shared(token[:-2] + "xx").status_code, 404)
+        self.assertEqual(self.get_shared(forged).status_code, 404)
+
+    def test_expired_link(self):
+        token = self.link_token("public/report.txt")
+
+        with mock.patch("clients.sharing.time.time", return_value=time.time() + 8 * 86400):
+            response = self.get_shared(token)
+
+        self.assertEqual(response.status_code, 410)
+
+    def test_revoke_invalidates_existing_links(self):
+        token = self.link_token("public/report.txt")
+        self.assertEqual(self.get_shared(token).status_code, 200)
+
+        self.client.force_login(self.user)
+        self.client.post(reverse("revoke_share_links"))
+        self.client.logout()
+
+        self.assertEqual(self.get_shared(token).status_code, 410)
+        self.assertEqual(self.get_shared(self.link_token("public/report.txt")).status_code, 200)
+
+    def test_download_cap(self):
+        token = self.link_token("public/report.txt", max_downloads=2)
+
+        statuses = [self.get_shared(token).status_code for _ in range(3)]
+
+        self.assertEqual(statuses, [200, 200, 410])
+
+    def test_bandwidth_cap(self):
+        # 10-byte file, 25-byte allowance
+        token = self.link_token("public/report.txt", max_mb=25 / (1024 * 1024))
+
+        statuses = [self.get_shared(token).status_code for _ in range(3)]
+
+        self.assertEqual(statuses, [200, 200, 410])
+
+    def test_counter_evicted_mid_charge_is_restarted(self):
+        token = self.link_token("public/report.txt", max_downloads=1)
+        share_cache = caches["share_links"]
+
+        with mock.patch.object(share_cache, "incr", side_effect=ValueError("evicted")):
+            self.assertEqual(self.get_shared(token).status_code, 200)
+        self.assertEqual(self.get_shared(token).status_code, 410)
+
+    def test_negative_limits_are_rejected(self):
+        self.assertEqual(self.share("public/report.txt", max_downloads=-1).status_code, 400)
+        self.assertEqual(self.share("public/report.txt", max_mb=-1).status_code, 400)
+
+    def test_subpath_cannot_leave_shared_folder(self):
+        token = self.link_token("public")
+
+        self.assertEqual(self.get_shared(token, "report.txt").status_code, 200)
+        for subpath in ["../private.txt", "sub/../../private.txt"]:
+            response = self.get_shared(token, subpath)
+            self.assertEqual(response.status_code, 404, subpath)
+
+
+class IntegrityTests(StorageTestCase):
+    def upload(self, relative_path, content):
+        self.client.force_login(self.user)
+        with redirect_stdout(io.StringIO()):  # upload_file prints debug lines
+            response = self.client.post(reverse("upload"), {
+                "files": [SimpleUploadedFile(os.path.basename(relative_path), content)],
+                "file_paths[]": [relative_path],
+            })
+        self.assertEqual(response.status_code, 302)
+
+    def scrub(self):
+        errors = io.StringIO()
+        # scrub_files renices itself, which would stick to the test process
+        with mock.patch("clients.management.commands.scrub_files.os.nice"):
+            call_command("scrub_files", older_than=0, rate=0, stdout=io.StringIO(), stderr=errors)
+        return errors.getvalue()
+
+    def test_reupload_replaces_row_and_survives_scrub(self):
+        self.upload("doc.txt", b"first version")
+        first_etag = self.client.get(reverse("download", args=["doc.txt"]))["ETag"]
+        self.upload("doc.txt", b"second version")
+
+        client_file = self.profile.files.get()
+        self.assertEqual(client_file.sha256, hashlib.sha256(b"second version").hexdigest())
+
+        self.assertEqual(self.scrub(), "")
+        client_file.refresh_from_db()
+        self.assertFalse(client_file.quarantined)
+
+        response = self.client.get(reverse("download", args=["doc.txt"]), HTTP_IF_NONE_MATCH=first_etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), b"second version")
+        self.assertEqual(response["ETag"], f'"{client_file.sha256}"')
+
+    def test_scrub_ignores_superseded_duplicate_rows(self):
+        # Left behind by uploads made before re-uploads reused the row
+        stale = self.add_file("doc.txt", b"old")
+        self.add_file("doc.txt", b"new")
+
+        self.assertEqual(self.scrub(), "")
+        stale.refresh_from_db()
+        self.assertFalse(stale.quarantined)
+        self.assertTrue(self.exists("doc.txt"))
+
+    def test_scrub_leaves_file_reuploaded_mid_check(self):
+        client_file = self.add_file("doc.txt", b"old")
+
+        def reupload_while_hashing(path, rate=None):
+            with open(path, "wb") as f:
+                f.write(b"new")
+            ClientFile.objects.filter(pk=client_file.pk).update(sha256=hashlib.sha256(b"new").hexdigest())
+            return hashlib.sha256(b"new").hexdigest()
+
+        with mock.patch("clients.management.commands.scrub_files.hash_file", reupload_while_hashing):
+            self.assertEqual(self.scrub(), "")
+
+        client_file.refresh_from_db()
+        self.assertFalse(client_file.quarantined)
+        self.assertTrue(self.exists("doc.txt"))
+
+    def test_scrub_quarantines_corrupted_file(self):
+        self.add_file("doc.txt", b"original")
+        with open(os.path.join(self.profile.storage_path, "doc.txt"), "wb") as f:
+            f.write(b"bit rot")
+
+        self.assertIn("CORRUPTED", self.scrub())
+        self.assertFalse(self.exists("doc.txt"))
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(reverse("download", args=["doc.txt"])).status_code, 409)
+
+
+class SnapshotTests(StorageMixin, TransactionTestCase):
+    # The SQLite backup API cannot read the database while TestCase holds
+    # its wrapping transaction open, so these tests commit for real
+    def snapshot(self):
+        log = []
+        name = backup.create_snapshot(log=log.append)
+        # Names have one-second resolution; move it aside so the next one is distinct
+        older = f"{len(backup.list_snapshots()):08d}-000000"
+        os.rename(os.path.join(backup.settings.BACKUP_ROOT, name), os.path.join(backup.settings.BACKUP_ROOT, older))
+        return older, log[-1]
+
+    def snapshot_file(self, name, relative_path):
+        return os.path.join(backup.settings.BACKUP_ROOT, name, backup.USERS_DIR, "ada", relative_path)
+
+    def test_unchanged_files_are_hardlinked(self):
+        self.add_file("same.txt", b"same")
+        self.add_file("changes.txt", b"v1")
+        first, log = self.snapshot()
+        self.assertIn("2 copied, 0 unchanged", log)
+
+        changed = os.path.join(self.profile.storage_path, "changes.txt")
+        with open(changed, "wb") as f:
+            f.write(b"v2")
+        os.utime(changed, ns=(0, 0))
+        second, log = self.snapshot()
+
+        self.assertIn("1 copied, 1 unchanged", log)
+        self.assertEqual(
+            os.stat(self.snapshot_file(first, "same.txt")).st_ino,
+            os.stat(self.snapshot_file(second, "same.txt")).st_ino,
+        )
+        with open(self.snapshot_file(first, "changes.txt"), "rb") as f:
+            self.assertEqual(f.read(), b"v1")
+        with open(self.snapshot_file(second, "changes.txt"), "rb") as f:
+            self.assertEqual(f.read(), b"v2")
+
+    def test_duplicate_rows_are_backed_up_once(self):
+        self.add_file("doc.txt", b"same")
+        self.add_file("doc.txt", b"same")
+        first, _ = self.snapshot()
+
+        second, log = self.snapshot()
+
+        self.assertIn("0 copied, 1 unchanged", log)
+        self.assertEqual(os.stat(self.snapshot_file(first, "doc.txt")).st_nlink, 2)
+
+    def test_restore_user(self):
+        self.add_file("keep.txt", b"original")
+        self.add_file("deleted.txt", b"gone soon")
+        other = ClientProfile.objects.get(user=User.objects.create_user("bob", password="secret"))
+        with open(os.path.join(other.storage_path, "bob.txt"), "wb") as f:
+            f.write(b"bob")
+        name, _ = self.snapshot()
+
+        self.profile.files.get(relative_path="deleted.txt").delete()
+        os.remove(os.path.join(self.profile.storage_path, "deleted.txt"))
+        with open(os.path.join(self.profile.storage_path, "keep.txt"), "wb") as f:
+            f.write(b"overwritten")
+        self.add_file("new.txt", b"after the snapshot")
+        with open(os.path.join(other.storage_path, "bob.txt"), "wb") as f:
+            f.write(b"bob, later")
+
+        backup.restore_user(name, "ada", log=lambda message: None)
+
+        self.assertEqual(self.stored_paths(), ["deleted.txt", "keep.txt"])
+        with open(os.path.join(self.profile.storage_path, "keep.txt"), "rb") as f:
+            self.assertEqual(f.read(), b"original")
+        self.assertTrue(self.exists("deleted.txt"))
+        self.assertFalse(self.exists("new.txt"))
+        # Restored files are copies, never links back into the snapshot
+        self.assertEqual(os.stat(os.path.join(self.profile.storage_path, "keep.txt")).st_nlink, 1)
+        with open(os.path.join(other.storage_path, "bob.txt"), "rb") as f:
+            self.assertEqual(f.read(), b"bob, later")
+
+
+class HLSTests(StorageTestCase):
+    def setUp(self):
+        super().setUp()
+        self.video = self.add_file("clip.mp4", b"not really a video")
+
+    def write_rendition(self, client_file):
+        self.write_rendition_to(client_file.hls_dir)
+
+    def write_rendition_to(self, hls_dir):
+        os.makedirs(os.path.join(hls_dir, "v0"), exist_ok=True)
+        for name in ["master.m3u8", "v0/index.m3u8", "v0/seg_00000.ts"]:
+            with open(os.path.join(hls_dir, name), "w") as f:
+                f.write(name)
+
+    def get_asset(self, asset, client_file=None):
+        client_file = client_file or self.video
+        return self.client.get(reverse("hls_asset", args=[client_file.pk, client_file.hls_version, asset]))
+
+    def fake_tools(self, ffmpeg_error=None):
+        def run(cmd, **kwargs):
+            if cmd[0] == "ffprobe":
+                streams = [{"codec_type": "video", "height": 720}, {"codec_type": "audio"}]
+                return subprocess.CompletedProcess(cmd, 0, json.dumps({"streams": streams}).encode(), b"")
+            if ffmpeg_error:
+                raise ffmpeg_error
+            return subprocess.CompletedProcess(cmd, 0, b"", b"")
+        return mock.patch("clients.media.subprocess.run", side_effect=run)
+
+    def package(self):
+        output = io.StringIO()
+        call_command("package_hls", stdout=output, stderr=output)
+        self.video.refresh_from_db()
+        return output.getvalue()
+
+    def test_owner_can_fetch_ready_assets(self):
+        self.video.hls_status = ClientFile.HLS_READY
+        self.video.save()
+        self.write_rendition(self.video)
+        self.client.force_login(self.user)
+
+        response = self.get_asset("v0/seg_00000.ts")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "video/mp2t")
+        self.assertEqual(self.get_asset("master.m3u8")["Content-Type"], "application/vnd.apple.mpegurl")
+
+    def test_other_users_and_unready_files_get_404(self):
+        self.write_rendition(self.video)
+        self.client.force_login(self.user)
+        self.assertEqual(self.get_asset("master.m3u8").status_code, 404)  # not READY yet
+
+        self.video.hls_status = ClientFile.HLS_READY
+        self.video.save()
+        self.client.force_login(User.objects.create_user("eve", password="secret"))
+        self.assertEqual(self.get_asset("master.m3u8").status_code, 404)
+
+    def test_only_playlists_and_segments_inside_the_folder(self):
+        self.video.hls_status = ClientFile.HLS_READY
+        self.video.save()
+        self.write_rendition(self.video)
+        with open(os.path.join(self.video.hls_dir, "notes.txt"), "w") as f:
+            f.write("not a rendition")
+        self.client.force_login(self.user)
+
+        for asset in ["notes.txt", "../../user_data/ada/clip.mp4", "v0/../../x.m3u8"]:
+            self.assertEqual(self.get_asset(asset).status_code, 404, asset)
+
+    def test_package_marks_ready(self):
+        self.video.hls_status = ClientFile.HLS_PENDING
+        self.video.save()
+
+        with self.fake_tools():
+            self.package()
+
+        self.assertEqual(self.video.hls_status, ClientFile.HLS_READY)
+        self.assertTrue(os.path.isdir(self.video.hls_dir))
+
+    def test_ffmpeg_failure_marks_failed(self):
+        self.video.hls_status = ClientFile.HLS_PENDING
+        self.video.save()
+
+        with self.fake_tools(ffmpeg_error=subprocess.CalledProcessError(1, "ffmpeg", stderr=b"bad input")):
+            self.package()
+
+        self.assertEqual(self.video.hls_status, ClientFile.HLS_FAILED)
+        self.assertFalse(os.path.exists(self.video.hls_dir))
+
+    def test_filesystem_error_marks_failed(self):
+        self.video.hls_status = ClientFile.HLS_PENDING
+        self.video.save()
+
+        with self.fake_tools(), mock.patch("clients.media.tempfile.mkdtemp", side_effect=OSError("disk full")):
+            self.assertIn("disk full", self.package())
+
+        self.assertEqual(self.video.hls_status, ClientFile.HLS_FAILED)
+
+    def test_deleting_row_removes_renditions(self):
+        self.write_rendition(self.video)
+        hls_dir = self.video.hls_base_dir
+
+        self.video.delete()
+
+        self.assertFalse(os.path.exists(hls_dir))
+
+    def test_reupload_gets_new_hls_urls(self):
+        self.video.hls_status = ClientFile.HLS_READY
+        self.video.save()
+        self.write_rendition(self.video)
+        old_url = reverse("hls_asset", args=[self.video.pk, self.video.hls_version, "master.m3u8"])
+        old_dir = self.video.hls_dir
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(old_url).status_code, 200)
+
+        with redirect_stdout(io.StringIO()):
+            self.client.post(reverse("upload"), {
+                "files": [SimpleUploadedFile("clip.mp4", b"a different video")], "file_paths[]": ["clip.mp4"],
+            })
+        self.video.refresh_from_db()
+        self.assertEqual(self.video.hls_status, ClientFile.HLS_PENDING)
+        # The cached-forever URL must not start serving the new content
+        self.assertEqual(self.client.get(old_url).status_code, 404)
+
+        def ffmpeg_writes_renditions(cmd, **kwargs):
+            if cmd[0] == "ffprobe":
+                return subprocess.CompletedProcess(cmd, 0, b'{"streams": [{"codec_type": "video"}]}', b"")
+            self.write_rendition_to(os.path.dirname(os.path.dirname(cmd[-1])))
+            return subprocess.CompletedProcess(cmd, 0, b"", b"")
+
+        with mock.patch("clients.media.subprocess.run", side_effect=ffmpeg_writes_renditions):
+            self.package()
+
+        new_url = reverse("hls_asset", args=[self.video.pk, self.video.hls_version, "master.m3u8"])
+        self.assertNotEqual(new_url, old_url)
+        self.assertEqual(self.client.get(new_url).status_code, 200)
+        self.assertEqual(self.client.get(old_url).status_code, 404)
+        self.assertFalse(os.path.exists(old_dir))
+
+
+class MetadataTests(StorageTestCase):
+    def test_image_exif(self):
+        from PIL import Image
+
+        exif = Image.Exif()
+        exif[271] = "Canon"
+        exif[272] = "Canon EOS 80D"
+        exif[306] = "2024:05:01 10:30:00"
+        buffer = io.BytesIO()
+        Image.new("RGB", (64, 48)).save(buffer, "JPEG", exif=exif)
+        photo = self.add_file("photo.jpg", buffer.getvalue())
+
+        extract_metadata(photo)
+
+        self.assertTrue(photo.metadata_extracted)
+        self.assertEqual((photo.width, photo.height, photo.camera), (64, 48, "Canon EOS 80D"))
+        self.assertEqual(photo.taken_at.strftime("%Y-%m-%d %H:%M"), "2024-05-01 10:30")
+
+    def test_pdf_page_count(self):
+        from pypdf import PdfWriter
+
+        writer = PdfWriter()
+        for _ in range(3):
+            writer.add_blank_page(width=200, height=200)
+        buffer = io.BytesIO()
+        writer.write(buffer)
+        document = self.add_file("paper.pdf", buffer.getvalue())
+
+        self.assertEqual(extract_metadata(document).page_count, 3)
+
+    def test_unreadable_file_is_still_marked_extracted(self):
+        broken = self.add_file("broken.jpg", b"not a jpeg")
+
+        extract_metadata(broken)
+
+        self.assertTrue(broken.metadata_extracted)
+        self.assertIsNone(broken.width)
+
+    def test_impossible_creation_time_is_ignored(self):
+        clip = self.add_file("clip.mp4")
+        info = {"format": {"duration": "12.5", "tags": {"creation_time": "0000-00-00T00:00:00.000000Z"}}}
+
+        with mock.patch("clients.metadata.probe", return_value=info):
+            extract_metadata(clip)
+
+        self.assertEqual((clip.duration, clip.taken_at), (12.5, None))
+
+    def test_worker_skips_rows_reuploaded_mid_batch(self):
+        document = self.add_file("a.pdf", b"old")
+
+        def reupload_then_extract(client_file):
+            ClientFile.objects.filter(pk=document.pk).update(sha256="0" * 64)
+            client_file.page_count = 7
+            client_file.metadata_extracted = True
+            return client_file
+
+        with mock.patch("clients.management.commands.extract_metadata.extract_metadata", reupload_then_extract):
+            call_command("extract_metadata", stdout=io.StringIO())
+
+        document.refresh_from_db()
+        self.assertEqual((document.metadata_extracted, document.page_count), (False, None))
+
+
+class ListingOptionTests(StorageTestCase):
+    def setUp(self):
+        super().setUp()
+        for name, duration, camera in [
+            ("short.mp4", 60, ""), ("long.mp4", 600, ""), ("a.jpg", None, "Pixel 8"), ("b.jpg", None, "EOS R5"),
+        ]:
+            client_file = self.add_file(name)
+            client_file.duration, client_file.camera = duration, camera
+            client_file.save()
+
+    def listing(self, **params):
+        files, options = apply_listing_options(self.profile.files.all(), RequestFactory().get("/", params))
+        return [f.name for f in files], options
+
+    def test_default_is_upload_order(self):
+        names, options = self.listing()
+
+        self.assertEqual(names, ["short.mp4", "long.mp4", "a.jpg", "b.jpg"])
+        self.assertEqual(options["sort"], "uploaded")
+        self.assertEqual(list(options["cameras"]), ["EOS R5", "Pixel 8"])
+
+    def test_sort_by_duration_puts_unknown_last(self):
+        names, _ = self.listing(sort="duration")
+
+        self.assertEqual(names[:2], ["long.mp4", "short.mp4"])
+
+    def test_min_minutes_and_camera_filters(self):
+        self.assertEqual(self.listing(min_minutes="5")[0], ["long.mp4"])
+        self.assertEqual(self.listing(camera="Pixel 8")[0], ["a.jpg"])
+
+    def test_invalid_input_falls_back(self):
+        names, options = self.listing(sort="; DROP TABLE", min_minutes="lots")
+
+        self.assertEqual(len(names), 4)
+        self.assertEqual((options["sort"], options["min_minutes"]), ("uploaded", ""))
+
+
+class UsageTests(StorageTestCase):
+    def snapshot(self, profile, days_ago, used_bytes, today=date(2026, 6, 30)):
+        return UsageSnapshot.objects.create(
+            client=profile, taken_on=today - timedelta(days=days_ago), used_bytes=used_bytes, file_count=0
+        )
+
+    def test_counts_per_type(self):
+        for name in ["a.jpg", "b.PNG", "c.mp4", "d.ogg", "e.mp3", "f.pdf", "g.txt"]:
+            self.add_file(name, b"x" * 1024)
+
+        record_usage_snapshots()
+
+        snapshot = UsageSnapshot.objects.get(client=self.profile)
+        self.assertEqual(snapshot.taken_on, timezone.localdate())
+        self.assertEqual(snapshot.file_count, 7)
+        self.assertEqual(snapshot.used_bytes, 7 * 1024)
+        # .ogg is both a video and an audio extension; it is counted once, as video
+        self.assertEqual(
+            (snapshot.image_count, snapshot.video_count, snapshot.audio_count, snapshot.pdf_count, snapshot.other_count),
+            (2, 2, 1, 1, 1),
+        )
+
+    def test_same_day_run_replaces_rows(self):
+        self.add_file("a.txt")
+        record_usage_snapshots()
+        self.add_file("b.txt")
+
+        record_usage_snapshots()
+
+        self.assertEqual(UsageSnapshot.objects.get(client=self.profile).file_count, 2)
+
+    def test_growth_against_30_day_baseline(self):
+        self.snapshot(self.profile, 45, 100)
+        self.snapshot(self.profile, 31, 200)
+        self.snapshot(self.profile, 10, 400)
+        self.snapshot(self.profile, 0, 500)
+
+        row = tenant_usage(date(2026, 6, 30)).get(client=self.profile)
+
+        self.assertEqual(row.growth, 300)
+
+    def test_growth_of_young_tenant_is_since_first_snapshot(self):
+        self.snapshot(self.profile, 5, 50)
+        self.snapshot(self.profile, 0, 80)
+
+        self.assertEqual(tenant_usage(date(2026, 6, 30)).get(client=self.profile).growth, 30)
+
+
+class CapacityViewTests(StorageTestCase):
+    def setUp(self):
+        super().setUp()
+        admin_user = User.objects.create_superuser("root", password="secret")
+        for name in ["bea", "cal"]:
+            User.objects.create_user(name, password="secret")
+        day = timezone.localdate()
+        for used, profile in enumerate(ClientProfile.objects.exclude(user=admin_user).order_by("user__username")):
+            UsageSnapshot.objects.create(client=profile, taken_on=day, used_bytes=(used + 1) * 1000, file_count=3 - used)
+        self.client.force_login(admin_user)
+
+    def report(self, **params):
+        response = self.client.get(reverse("admin:clients_capacity"), params)
+        self.assertEqual(response.status_code, 200)
+        return response.context["order"], [row.client.user.username for row in response.context["page"]]
+
+    def test_orderings(self):
+        self.assertEqual(self.report(), ("used", ["cal", "bea", "ada"]))
+        self.assertEqual(self.report(o="name"), ("name", ["ada", "bea", "cal"]))
+        self.assertEqual(self.report(o="files"), ("files", ["ada", "bea", "cal"]))
+
+    def test_unknown_ordering_falls_back(self):
+        self.assertEqual(self.report(o="client__user__password"), ("used", ["cal", "bea", "ada"]))
+
+    def test_pagination(self):
+        with mock.patch.object(clients_admin, "CAPACITY_PAGE_SIZE", 2):
+            self.assertEqual(self.report(o="name")[1], ["ada", "bea"])
+            self.assertEqual(self.report(o="name", p=2)[1], ["cal"])
+            self.assertEqual(self.report(o="name", p="junk")[1], ["ada", "bea"])
+
+    def test_record_now_button(self):
+        UsageSnapshot.objects.all().delete()
+
+        response = self.client.post(reverse("admin:clients_capacity"))
+
+        self.assertRedirects(response, reverse("admin:clients_capacity"))
+        self.assertEqual(UsageSnapshot.objects.count(), ClientProfile.objects.count())
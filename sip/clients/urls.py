@@ -12,4 +12,11 @@ urlpatterns = [
     path('logout/', auth_views.LogoutView.as_view(next_page='login'), name='logout'),
     path('delete-folder/<path:folder_name>/', views.delete_folder, name='delete_folder'),  # Changed to <path:>
     path('folder/<path:folder_name>/', views.folder_view, name='folder_view'),  # NEW
+    path('move/', views.move_item, name='move'),
+    path('copy/', views.copy_item, name='copy'),
+    path('share/', views.create_share_link, name='create_share_link'),
+    path('share/revoke/', views.revoke_share_links, name='revoke_share_links'),
+    path('s/<str:token>/', views.shared_link, name='shared_link'),
+    path('s/<str:token>/<path:subpath>', views.shared_link, name='shared_file'),
+    path('hls/<int:file_id>/<int:version>/<path:asset>', views.hls_asset, name='hls_asset'),
 ]
\ No newline at end of file
@@ -0,0 +1,78 @@
+# clients/usage.py
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import (
+    AUDIO_EXTENSIONS, IMAGE_EXTENSIONS, VIDEO_EXTENSIONS,
+    ClientProfile, UsageSnapshot, extension_q,
+)
+
+GROWTH_DAYS = 30
+
+
+def record_usage_snapshots(day=None):
+    """
+    Store one UsageSnapshot per tenant for `day` (default today), computed by a
+    single GROUP BY over ClientFile rather than walking anyone's folder.
+    Re-running on the same day replaces that day's rows.
+    """
+    day = day or timezone.localdate()
+    # ".ogg" is both; listings show it as video, so count it there only
+    audio_only = [ext for ext in AUDIO_EXTENSIONS if ext not in VIDEO_EXTENSIONS]
+    totals = ClientProfile.objects.annotate(
+        total_mb=Coalesce(Sum("files__size"), Value(0.0)),
+        file_count=Count("files"),
+        image_count=Count("files", filter=extension_q(IMAGE_EXTENSIONS, "files__")),
+        video_count=Count("files", filter=extension_q(VIDEO_EXTENSIONS, "files__")),
+        audio_count=Count("files", filter=extension_q(audio_only, "files__")),
+        pdf_count=Count("files", filter=extension_q([".pdf"], "files__")),
+    ).values_list(
+        "id", "total_mb", "file_count", "image_count", "video_count", "audio_count", "pdf_count"
+    )
+
+    snapshots = [
+        UsageSnapshot(
+            client_id=client_id, taken_on=day, used_bytes=int(total_mb * 1024 * 1024),
+            file_count=files, image_count=images, video_count=videos, audio_count=audio, pdf_count=pdfs,
+        )
+        for client_id, total_mb, files, images, videos, audio, pdfs in totals.iterator()
+    ]
+    with transaction.atomic():
+        UsageSnapshot.objects.filter(taken_on=day).delete()
+        UsageSnapshot.objects.bulk_create(snapshots, batch_size=500)
+    return len(snapshots)
+
+
+def latest_snapshot_day():
+    return UsageSnapshot.objects.order_by("-taken_on").values_list("taken_on", flat=True).first()
+
+
+def tenant_usage(day):
+    """Snapshots for `day`, annotated with growth over the previous GROWTH_DAYS."""
+    tenant_snapshots = UsageSnapshot.objects.filter(client=OuterRef("client"))
+    baseline = tenant_snapshots.filter(
+        taken_on__lte=day - timedelta(days=GROWTH_DAYS)
+    ).order_by("-taken_on").values("used_bytes")[:1]
+    # Tenants younger than GROWTH_DAYS: growth since their first snapshot
+    first = tenant_snapshots.order_by("taken_on").values("used_bytes")[:1]
+    return (
+        UsageSnapshot.objects.filter(taken_on=day)
+        .select_related("client__user")
+        .annotate(growth=F("used_bytes") - Coalesce(Subquery(baseline), Subquery(first), Value(0)))
+    )
+
+
+def usage_history(days=90):
+    """[(day, total_bytes, total_files)] across all tenants, oldest first."""
+    since = timezone.localdate() - timedelta(days=days)
+    return list(
+        UsageSnapshot.objects.filter(taken_on__gte=since)
+        .values("taken_on")
+        .annotate(total=Sum("used_bytes"), files=Sum("file_count"))
+        .order_by("taken_on")
+        .values_list("taken_on", "total", "files")
+    )
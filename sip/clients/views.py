@@ -1,16 +1,23 @@
+import hashlib
+import mimetypes
 import os
 import shutil
 from django.shortcuts import render, redirect, get_object_or_404
-from django.http import FileResponse, HttpResponse
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import content_disposition_header
+from django.http import FileResponse, HttpResponse, Http404, JsonResponse
 from django.conf import settings
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
 from django.contrib.auth.models import User
 
-from urllib.parse import unquote
+from urllib.parse import quote, unquote
 
+from . import fileops, sharing
+from .integrity import digest_headers
 from .models import ClientFile, ClientProfile
-from django.db.models import Q
+from django.db.models import F, Q
 
 
 # -------------------- Admin helpers -------------------- #
@@ -32,6 +39,46 @@ def delete_client(request, user_id):
     return redirect('admin_dashboard')
 
 
+# -------------------- Listing sort / filter -------------------- #
+# Everything here works on indexed ClientFile columns; no file is opened.
+SORT_OPTIONS = {
+    "uploaded": ("Upload date", [F("uploaded_at").asc()]),
+    "name": ("Name", [F("name").asc()]),
+    "taken": ("Date taken", [F("taken_at").desc(nulls_last=True), F("uploaded_at").asc()]),
+    "duration": ("Longest", [F("duration").desc(nulls_last=True), F("uploaded_at").asc()]),
+    "size": ("Largest", [F("size").desc()]),
+}
+
+
+def apply_listing_options(files, request):
+    """Apply ?sort=, ?min_minutes= and ?camera= to a ClientFile queryset."""
+    sort = request.GET.get("sort", "uploaded")
+    if sort not in SORT_OPTIONS:
+        sort = "uploaded"
+    options = {
+        "sort": sort,
+        "sort_options": [(key, label) for key, (label, _) in SORT_OPTIONS.items()],
+        "min_minutes": request.GET.get("min_minutes", ""),
+        "camera": request.GET.get("camera", ""),
+        "cameras": (
+            files.exclude(camera="").order_by("camera")
+            .values_list("camera", flat=True).distinct()
+        ),
+    }
+
+    try:
+        min_minutes = float(options["min_minutes"]) if options["min_minutes"] else None
+    except ValueError:
+        min_minutes = None
+        options["min_minutes"] = ""
+    if min_minutes is not None:
+        files = files.filter(duration__gte=min_minutes * 60)
+    if options["camera"]:
+        files = files.filter(camera=options["camera"])
+
+    return files.order_by(*SORT_OPTIONS[sort][1]), options
+
+
 # -------------------- Client Dashboard -------------------- #
 @login_required
 def dashboard(request):
@@ -59,7 +106,7 @@ def dashboard(request):
     os.makedirs(storage_path, exist_ok=True)
 
     # Group files into folders and standalone
-    all_files = client_profile.files.all()
+    all_files, listing = apply_listing_options(client_profile.files.all(), request)
     folders_dict = {}
     standalone_files = []
 
@@ -89,7 +136,8 @@ def dashboard(request):
         "folders": folder_list,
         "used_mb": used_mb,
         "limit_mb": limit_mb,
-        "over_quota": over_quota
+        "over_quota": over_quota,
+        **listing,
     })
 
 
@@ -99,8 +147,9 @@ def folder_view(request, folder_name):
     client_profile = ClientProfile.objects.get(user=request.user)
     
     # Get all files in this folder
-    files_in_folder = client_profile.files.filter(
-        relative_path__startswith=folder_name + '/'
+    files_in_folder, listing = apply_listing_options(
+        client_profile.files.filter(relative_path__startswith=folder_name + '/'),
+        request
     )
     
     # Organize into subfolders and files
@@ -141,7 +190,8 @@ def folder_view(request, folder_name):
         "subfolders": subfolder_list,
         "used_mb": used_mb,
         "limit_mb": limit_mb,
-        "over_quota": over_quota
+        "over_quota": over_quota,
+        **listing,
     })
 
 
@@ -202,16 +252,40 @@ def upload_file(request):
         if file_dir:  # Only create if there's a directory path
             os.makedirs(file_dir, exist_ok=True)
 
+        # Hash while streaming to disk so integrity costs no extra read
+        hasher = hashlib.sha256()
         with open(full_path, 'wb+') as dest:
             for chunk in uploaded_file.chunks():
                 dest.write(chunk)
-
-        ClientFile.objects.create(
-            client=client_profile,
-            name=os.path.basename(relative_path),
-            relative_path=relative_path,
-            size=uploaded_file.size / (1024 * 1024)
-        )
+                hasher.update(chunk)
+
+        # Re-uploading to an existing path replaces the file, so reuse its row;
+        # a second row would keep the old hash and fail the next scrub
+        existing = list(client_profile.files.filter(
+            Q(relative_path=relative_path) | Q(relative_path="", name=relative_path)
+        ).order_by("-pk"))
+        client_file = existing[0] if existing else ClientFile(client=client_profile)
+        for duplicate in existing[1:]:
+            duplicate.delete()
+
+        client_file.name = os.path.basename(relative_path)
+        client_file.relative_path = relative_path
+        client_file.size = uploaded_file.size / (1024 * 1024)
+        client_file.sha256 = hasher.hexdigest()
+        client_file.verified_at = timezone.now()
+        client_file.quarantined = False
+        # EXIF/duration/page count are filled in by the extract_metadata worker
+        client_file.metadata_extracted = False
+        client_file.taken_at = client_file.width = client_file.height = None
+        client_file.duration = client_file.page_count = None
+        client_file.camera = ""
+        if client_file.is_video:
+            # Picked up by the package_hls worker
+            client_file.hls_status = ClientFile.HLS_PENDING
+            if client_file.pk:
+                # New content under the same row: give it fresh HLS URLs
+                client_file.hls_version += 1
+        client_file.save()
 
     messages.success(request, f"{len(uploaded_files)} file(s) uploaded successfully!")
     return redirect("dashboard")
@@ -226,12 +300,57 @@ def download_file(request, filename):
     # Decode the filename (it may contain URL encoding)
     filename = unquote(filename)
     
+    client_file = client_profile.files.filter(
+        Q(relative_path=filename) | Q(relative_path="", name=filename)
+    ).only("sha256", "quarantined").order_by("-pk").first()
+    if client_file and client_file.quarantined:
+        return HttpResponse("This file failed an integrity check and has been quarantined.", status=409)
+
+    headers = digest_headers(client_file.sha256) if client_file and client_file.sha256 else {}
+    if headers and request.headers.get("If-None-Match") == headers["ETag"]:
+        response = HttpResponse(status=304)
+        response["ETag"] = headers["ETag"]
+        return response
+
     file_path = os.path.join(client_profile.storage_path, filename)
     if os.path.exists(file_path) and os.path.isfile(file_path):
-        return FileResponse(open(file_path, "rb"), as_attachment=True)
+        response = FileResponse(open(file_path, "rb"), as_attachment=True)
+        for header, value in headers.items():
+            response[header] = value
+        return response
     return HttpResponse("File not found", status=404)
 
 
+HLS_CONTENT_TYPES = {
+    ".m3u8": "application/vnd.apple.mpegurl",
+    ".ts": "video/mp2t",
+}
+
+
+@login_required
+def hls_asset(request, file_id, version, asset):
+    client_file = get_object_or_404(
+        ClientFile, pk=file_id, hls_version=version, client__user=request.user, hls_status=ClientFile.HLS_READY
+    )
+
+    # SECURITY: only serve playlists/segments from inside this file's HLS folder
+    asset = os.path.normpath(asset)
+    extension = os.path.splitext(asset)[1]
+    if asset.startswith("..") or os.path.isabs(asset) or extension not in HLS_CONTENT_TYPES:
+        raise Http404
+
+    asset_path = os.path.join(client_file.hls_dir, asset)
+    if not os.path.isfile(asset_path):
+        raise Http404
+
+    response = FileResponse(open(asset_path, "rb"), content_type=HLS_CONTENT_TYPES[extension])
+    # Segment and playlist URLs are keyed by file id and content version, so a
+    # URL never changes meaning and the browser can keep it; "private" keeps
+    # shared proxies out of it.
+    response["Cache-Control"] = "private, max-age=31536000, immutable"
+    return response
+
+
 @login_required
 def delete_file(request, filename):
     client_profile = ClientProfile.objects.get(user=request.user)
@@ -291,4 +410,128 @@ def delete_folder(request, folder_name):
         shutil.rmtree(folder_path)
 
     messages.success(request, f"Folder '{folder_name}' deleted.")
-    return redirect("dashboard")
\ No newline at end of file
+    return redirect("dashboard")
+
+
+# -------------------- Move / Rename / Copy -------------------- #
+def redirect_to_parent(path):
+    parent = os.path.dirname(path)
+    if parent:
+        return redirect('folder_view', folder_name=parent)
+    return redirect("dashboard")
+
+
+@login_required
+def move_item(request):
+    """Move or rename a file/folder. POST: source, destination (relative paths)."""
+    if request.method != "POST":
+        return redirect("dashboard")
+
+    client_profile = ClientProfile.objects.get(user=request.user)
+    source = request.POST.get("source", "")
+    destination = request.POST.get("destination", "")
+
+    try:
+        fileops.move(client_profile, source, destination)
+    except (fileops.FileOperationError, OSError) as e:
+        messages.error(request, f"Move failed: {e}")
+        return redirect_to_parent(source)
+
+    messages.success(request, f"Moved '{source}' to '{destination}'.")
+    return redirect_to_parent(fileops.clean_relative_path(destination))
+
+
+@login_required
+def copy_item(request):
+    """Copy a file/folder on the server. POST: source, destination (relative paths)."""
+    if request.method != "POST":
+        return redirect("dashboard")
+
+    client_profile = ClientProfile.objects.get(user=request.user)
+    source = request.POST.get("source", "")
+    destination = request.POST.get("destination", "")
+
+    try:
+        fileops.copy(client_profile, source, destination)
+    except (fileops.FileOperationError, OSError) as e:
+        messages.error(request, f"Copy failed: {e}")
+        return redirect_to_parent(source)
+
+    messages.success(request, f"Copied '{source}' to '{destination}'.")
+    return redirect_to_parent(fileops.clean_relative_path(destination))
+
+
+# -------------------- Share links -------------------- #
+@login_required
+def create_share_link(request):
+    """POST: path, days, optional max_downloads / max_mb. Returns the link as JSON."""
+    if request.method != "POST":
+        return JsonResponse({'status': 'error', 'message': 'POST required'}, status=405)
+
+    client_profile = ClientProfile.objects.get(user=request.user)
+    try:
+        path = fileops.clean_relative_path(request.POST.get("path"))
+        days = int(request.POST.get("days") or 7)
+        max_downloads = int(request.POST.get("max_downloads") or 0)
+        max_bytes = int(float(request.POST.get("max_mb") or 0) * 1024 * 1024)
+    except (fileops.FileOperationError, ValueError) as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+    if max_downloads < 0 or max_bytes < 0:
+        return JsonResponse({'status': 'error', 'message': 'Limits cannot be negative'}, status=400)
+
+    if not os.path.exists(os.path.join(client_profile.storage_path, path)):
+        return JsonResponse({'status': 'error', 'message': 'File not found'}, status=404)
+
+    token = sharing.make_token(client_profile, path, days, max_downloads, max_bytes)
+    url = request.build_absolute_uri(reverse('shared_link', args=[token]))
+    return JsonResponse({'status': 'success', 'url': url})
+
+
+@login_required
+def revoke_share_links(request):
+    if request.method == "POST":
+        sharing.revoke_all(ClientProfile.objects.get(user=request.user))
+        messages.success(request, "All of your share links have been revoked.")
+    return redirect("dashboard")
+
+
+def shared_link(request, token, subpath=""):
+    """
+    Public fast path for share links. Everything needed is in the signed token
+    plus one cached owner lookup; the session and user are never touched.
+    """
+    try:
+        payload, storage_path = sharing.read_token(token)
+        target = os.path.join(storage_path, payload["p"])
+        if subpath:
+            target = os.path.join(target, fileops.clean_relative_path(subpath))
+
+        if os.path.isdir(target):
+            entries = sorted(os.scandir(target), key=lambda e: (not e.is_dir(), e.name.lower()))
+            return render(request, "clients/shared_folder.html", {
+                "token": token,
+                "title": os.path.basename(payload["p"]),
+                "subpath": subpath,
+                "entries": [
+                    {"name": e.name, "is_dir": e.is_dir(), "path": os.path.join(subpath, e.name)}
+                    for e in entries if not e.name.startswith(".")
+                ],
+            })
+        if not os.path.isfile(target):
+            raise sharing.ShareLinkError("File not found")
+
+        sharing.charge_download(payload, os.path.getsize(target))
+    except fileops.FileOperationError:
+        return HttpResponse("File not found", status=404)
+    except sharing.ShareLinkError as e:
+        return HttpResponse(str(e), status=e.status)
+
+    if settings.SHARE_LINK_ACCEL_REDIRECT:
+        # Let the front proxy stream the bytes
+        response = HttpResponse(content_type=mimetypes.guess_type(target)[0] or "application/octet-stream")
+        response["X-Accel-Redirect"] = settings.SHARE_LINK_ACCEL_REDIRECT + quote(
+            os.path.relpath(target, settings.USER_DATA_ROOT)
+        )
+        response["Content-Disposition"] = content_disposition_header(True, os.path.basename(target))
+        return response
+    return FileResponse(open(target, "rb"), as_attachment=True)
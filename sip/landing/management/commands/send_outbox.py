@@ -0,0 +1,28 @@
+# landing/management/commands/send_outbox.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from landing.outbox import send_pending
+
+
+class Command(BaseCommand):
+    help = "Deliver queued contact-form emails over a reused SMTP connection."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--watch", type=int, metavar="SECONDS", default=0,
+            help="Keep running, polling the outbox every SECONDS.",
+        )
+        parser.add_argument("--batch-size", type=int, default=None)
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = send_pending(options["batch_size"])
+            if sent or failed:
+                self.stdout.write(f"Sent {sent}, failed {failed}.")
+            if not options["watch"]:
+                break
+            # Drain a backlog straight away, otherwise wait for new mail
+            if sent + failed == 0:
+                time.sleep(options["watch"])
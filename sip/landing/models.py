@@ -1,3 +1,39 @@
+import hashlib
+
 from django.db import models
+from django.utils import timezone
+
+
+class OutboxMessage(models.Model):
+    """An email waiting to be sent by the send_outbox worker."""
+    STATUS_PENDING = "pending"
+    STATUS_SENT = "sent"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_SENT, "Sent"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=255)
+    to = models.EmailField()
+    dedup_key = models.CharField(max_length=64, db_index=True)
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "next_attempt_at"])]
+
+    def __str__(self):
+        return f"{self.subject} -> {self.to}"
 
-# Create your models here.
+    @staticmethod
+    def make_dedup_key(subject, body, to):
+        return hashlib.sha256("\0".join([to, subject, body]).encode()).hexdigest()
@@ -0,0 +1,84 @@
+# landing/outbox.py
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+
+from .models import OutboxMessage
+
+
+def enqueue(subject, body, from_email, to):
+    """
+    Queue one email. Identical messages queued within OUTBOX_DEDUP_SECONDS are
+    dropped, so a double-clicked form does not send twice.
+    """
+    key = OutboxMessage.make_dedup_key(subject, body, to)
+    recent = timezone.now() - timedelta(seconds=settings.OUTBOX_DEDUP_SECONDS)
+    if OutboxMessage.objects.filter(dedup_key=key, created_at__gte=recent).exists():
+        return None
+    return OutboxMessage.objects.create(
+        subject=subject, body=body, from_email=from_email, to=to, dedup_key=key
+    )
+
+
+def send_pending(batch_size=None):
+    """
+    Send due messages over a single SMTP connection. Failures are retried with
+    exponential backoff until OUTBOX_MAX_ATTEMPTS. Returns (sent, failed).
+    """
+    batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+    due = list(
+        OutboxMessage.objects.filter(
+            status=OutboxMessage.STATUS_PENDING, next_attempt_at__lte=timezone.now()
+        ).order_by("next_attempt_at", "pk")[:batch_size]
+    )
+    if not due:
+        return 0, 0
+
+    sent = failed = 0
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as e:
+        # Server unreachable: back off the whole batch without burning through it
+        for message in due:
+            _record_failure(message, e)
+        return 0, len(due)
+
+    try:
+        for message in due:
+            email = EmailMessage(
+                message.subject, message.body, message.from_email, [message.to], connection=connection
+            )
+            try:
+                email.send()
+            except Exception as e:
+                _record_failure(message, e)
+                failed += 1
+                # The connection may be unusable after an SMTP error
+                connection.close()
+                try:
+                    connection.open()
+                except Exception:
+                    break  # the rest stay pending for the next run
+            else:
+                message.status = OutboxMessage.STATUS_SENT
+                message.sent_at = timezone.now()
+                message.attempts += 1
+                message.save(update_fields=["status", "sent_at", "attempts"])
+                sent += 1
+    finally:
+        connection.close()
+    return sent, failed
+
+
+def _record_failure(message, error):
+    message.attempts += 1
+    message.last_error = str(error)[:1000]
+    if message.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+        message.status = OutboxMessage.STATUS_FAILED
+    else:
+        delay = settings.OUTBOX_RETRY_SECONDS * 2 ** (message.attempts - 1)
+        message.next_attempt_at = timezone.now() + timedelta(seconds=delay)
+    message.save(update_fields=["attempts", "last_error", "status", "next_attempt_at"])
@@ -0,0 +1,42 @@
+function openModal(plan) {
+  document.getElementById('contactModal').classList.add('active');
+  document.getElementById('plan').value = plan;
+  document.body.style.overflow = 'hidden';
+}
+
+function closeModal() {
+  document.getElementById('contactModal').classList.remove('active');
+  document.getElementById('contactForm').reset();
+  document.getElementById('formContent').style.display = 'block';
+  document.getElementById('successMessage').classList.remove('active');
+  document.body.style.overflow = 'auto';
+}
+
+document.getElementById('contactModal').addEventListener('click', function(e) {
+  if (e.target === this) {
+    closeModal();
+  }
+});
+
+async function handleSubmit(event) {
+  event.preventDefault();
+
+  const submitBtn = document.getElementById('submitBtn');
+  submitBtn.disabled = true;
+  submitBtn.textContent = 'Sending...';
+
+  const formData = {
+    name: document.getElementById('name').value,
+    email: document.getElementById('email').value,
+    phone: document.getElementById('phone').value,
+    company: document.getElementById('company').value,
+    message: document.getElementById('message').value,
+    plan: document.getElementById('plan').value
+  };
+
+  // Simulate API call
+  setTimeout(() => {
+    document.getElementById('formContent').style.display = 'none';
+    document.getElementById('successMessage').classList.add('active');
+  }, 1000);
+}
@@ -0,0 +1,82 @@
+// FAQ Toggle functionality
+document.querySelectorAll('.faq-item').forEach(item => {
+  const question = item.querySelector('.faq-question');
+  question.style.cursor = 'pointer';
+
+  question.addEventListener('click', () => {
+    const isActive = item.classList.contains('active');
+
+    document.querySelectorAll('.faq-item').forEach(otherItem => {
+      if (otherItem !== item) {
+        otherItem.classList.remove('active');
+      }
+    });
+
+    item.classList.toggle('active');
+  });
+});
+
+// Modal functionality
+function openModal(plan) {
+  document.getElementById('contactModal').classList.add('active');
+  document.getElementById('selectedPlan').textContent = plan;
+  document.getElementById('plan').value = plan;
+  document.body.style.overflow = 'hidden';
+}
+
+function closeModal() {
+  document.getElementById('contactModal').classList.remove('active');
+  document.getElementById('contactForm').reset();
+  document.getElementById('formContent').style.display = 'block';
+  document.getElementById('successMessage').classList.remove('active');
+  document.body.style.overflow = 'auto';
+}
+
+// Close modal when clicking outside
+document.getElementById('contactModal').addEventListener('click', function(e) {
+  if (e.target === this) {
+    closeModal();
+  }
+});
+
+// Form submission
+async function handleSubmit(event) {
+  event.preventDefault();
+
+  const submitBtn = document.getElementById('submitBtn');
+  submitBtn.disabled = true;
+  submitBtn.textContent = 'Sending...';
+
+  const formData = {
+    name: document.getElementById('name').value,
+    email: document.getElementById('email').value,
+    phone: document.getElementById('phone').value,
+    company: document.getElementById('company').value,
+    message: document.getElementById('message').value,
+    plan: document.getElementById('plan').value
+  };
+
+  try {
+    const response = await fetch(document.body.dataset.contactUrl, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        'X-CSRFToken': document.body.dataset.csrfToken
+      },
+      body: JSON.stringify(formData)
+    });
+
+    if (response.ok) {
+      document.getElementById('formContent').style.display = 'none';
+      document.getElementById('successMessage').classList.add('active');
+    } else {
+      alert('There was an error sending your message. Please try again.');
+      submitBtn.disabled = false;
+      submitBtn.textContent = 'Send Message';
+    }
+  } catch (error) {
+    alert('There was an error sending your message. Please try again.');
+    submitBtn.disabled = false;
+    submitBtn.textContent = 'Send Message';
+  }
+}
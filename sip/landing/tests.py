@@ -1,3 +1,136 @@
-from django.test import TestCase
+import json
+import socketserver
+import threading
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from .models import OutboxMessage
+from .outbox import send_pending
+
+
+class SMTPStandIn(socketserver.ThreadingTCPServer):
+    """Minimal local SMTP server that records every message it accepts."""
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, reject_rcpt=()):
+        self.messages = []
+        self.connections = 0
+        self.reject_rcpt = set(reject_rcpt)
+        super().__init__(("127.0.0.1", 0), SMTPHandler)
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self):
+        self.server.connections += 1
+        self.reply("220 localhost stand-in")
+        recipients = []
+        while True:
+            line = self.rfile.readline().decode().strip()
+            if not line:
+                return
+            command = line[:4].upper()
+            if command in ("EHLO", "HELO"):
+                self.reply("250 localhost")
+            elif command == "MAIL":
+                recipients = []
+                self.reply("250 OK")
+            elif command == "RCPT":
+                address = line.split(":", 1)[1].strip(" <>")
+                if address in self.server.reject_rcpt:
+                    self.reply("550 No such user")
+                else:
+                    recipients.append(address)
+                    self.reply("250 OK")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                data = []
+                while (chunk := self.rfile.readline()) not in (b".\r\n", b""):
+                    data.append(chunk)
+                self.server.messages.append((recipients, b"".join(data).decode()))
+                self.reply("250 OK")
+            elif command == "RSET":
+                self.reply("250 OK")
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Not implemented")
+
+
+class OutboxTests(TestCase):
+    def setUp(self):
+        self.smtp = SMTPStandIn(reject_rcpt={"bounce@example.com"})
+        threading.Thread(target=self.smtp.serve_forever, daemon=True).start()
+        self.addCleanup(self.smtp.server_close)
+        self.addCleanup(self.smtp.shutdown)
+
+        smtp_settings = override_settings(
+            EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend",
+            EMAIL_HOST="127.0.0.1",
+            EMAIL_PORT=self.smtp.port,
+            EMAIL_USE_TLS=False,
+            EMAIL_HOST_USER="",
+            EMAIL_HOST_PASSWORD="",
+        )
+        smtp_settings.enable()
+        self.addCleanup(smtp_settings.disable)
+
+    def post_contact(self, **overrides):
+        data = {"name": "Ada", "email": "ada@example.com", "plan": "Pro", "message": "Hi"}
+        data.update(overrides)
+        return self.client.post(reverse("contact_form"), json.dumps(data), content_type="application/json")
+
+    def test_contact_form_only_enqueues(self):
+        response = self.post_contact()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(OutboxMessage.objects.filter(status=OutboxMessage.STATUS_PENDING).count(), 2)
+        self.assertEqual(self.smtp.connections, 0)
+
+    def test_duplicate_submission_is_dropped(self):
+        self.post_contact()
+        self.post_contact()
+
+        self.assertEqual(OutboxMessage.objects.count(), 2)
+
+    def test_batch_is_sent_over_one_connection(self):
+        self.post_contact()
+        self.post_contact(email="grace@example.com", name="Grace")
+
+        sent, failed = send_pending()
+
+        self.assertEqual((sent, failed), (4, 0))
+        self.assertEqual(self.smtp.connections, 1)
+        self.assertEqual(len(self.smtp.messages), 4)
+        self.assertFalse(OutboxMessage.objects.exclude(status=OutboxMessage.STATUS_SENT).exists())
+
+    def test_failed_message_is_retried_later(self):
+        self.post_contact(email="bounce@example.com")
+
+        sent, failed = send_pending()
+
+        self.assertEqual((sent, failed), (1, 1))
+        bounced = OutboxMessage.objects.get(to="bounce@example.com")
+        self.assertEqual(bounced.status, OutboxMessage.STATUS_PENDING)
+        self.assertEqual(bounced.attempts, 1)
+        self.assertIn("550", bounced.last_error)
+        # Backed off, so an immediate second run has nothing due
+        self.assertEqual(send_pending(), (0, 0))
+
+    @override_settings(OUTBOX_MAX_ATTEMPTS=1)
+    def test_message_gives_up_after_max_attempts(self):
+        self.post_contact(email="bounce@example.com")
+
+        send_pending()
+
+        bounced = OutboxMessage.objects.get(to="bounce@example.com")
+        self.assertEqual(bounced.status, OutboxMessage.STATUS_FAILED)
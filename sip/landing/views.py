@@ -1,10 +1,11 @@
 from django.shortcuts import render
-from django.core.mail import send_mail, EmailMultiAlternatives
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 import json
 
+from .outbox import enqueue
+
 # Create your views here.
 # landing/views.py
 
@@ -42,12 +43,12 @@ Message:
 {message}
 """
         
-        send_mail(
+        # Queued only; the send_outbox worker talks to SMTP
+        enqueue(
             subject_to_dev,
             message_to_dev,
             'noreply@zephyr.com',  # From email
-            ['ghimireshashank2004@gmail.com'],  # Your email
-            fail_silently=False,
+            'ghimireshashank2004@gmail.com',  # Your email
         )
         
         # Confirmation email to user
@@ -63,12 +64,11 @@ Best regards,
 The Zephyr Team
 """
         
-        send_mail(
+        enqueue(
             subject_to_user,
             message_to_user,
             'noreply@zephyr.com',
-            [email],
-            fail_silently=False,
+            email,
         )
         
         return JsonResponse({'status': 'success'})
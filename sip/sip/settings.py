@@ -28,6 +28,65 @@ else:  # Raspberry Pi / Linux
 # Ensure the folder exists
 os.makedirs(USER_DATA_ROOT, exist_ok=True)
 
+# HLS renditions generated from uploaded videos live on the same disk but
+# outside the user folders, so they never count against a client's quota.
+if platform.system() == "Darwin":
+    HLS_ROOT = os.path.join(BASE_DIR, "hls_data/")
+else:
+    HLS_ROOT = "/mnt/data/sip_hls"
+
+# Files that fail a checksum re-verification are moved here by scrub_files
+if platform.system() == "Darwin":
+    QUARANTINE_ROOT = os.path.join(BASE_DIR, "quarantine/")
+else:
+    QUARANTINE_ROOT = "/mnt/data/sip_quarantine"
+
+# Where `manage.py snapshot` writes incremental backups. Point this at a
+# different disk than USER_DATA_ROOT for the backups to be worth anything.
+if platform.system() == "Darwin":
+    BACKUP_ROOT = os.path.join(BASE_DIR, "backups/")
+else:
+    BACKUP_ROOT = "/mnt/backup/sip_snapshots"
+
+# Disk read budget for the background scrubber, so it never starves uploads/downloads
+SCRUB_RATE_MB_PER_SECOND = 8
+
+FFMPEG_BINARY = "ffmpeg"
+FFPROBE_BINARY = "ffprobe"
+# A damaged or hostile file can make ffprobe spin; give up on it after this long
+FFPROBE_TIMEOUT_SECONDS = 30
+
+# (height, video bitrate, audio bitrate) - renditions taller than the source are skipped
+HLS_RENDITIONS = [
+    (360, "800k", "96k"),
+    (720, "2800k", "128k"),
+    (1080, "5000k", "192k"),
+]
+HLS_SEGMENT_SECONDS = 6
+
+# Share links are verified from the signature plus a cached (storage_path,
+# share_version) per owner. Owner info and the download/bandwidth cap
+# counters live in the SHARE_LINK_CACHE alias below, which every worker
+# process must share: the file-based default covers one host; point it at
+# django.core.cache.backends.redis.RedisCache when running several.
+SHARE_LINK_CACHE = "share_links"
+SHARE_LINK_MAX_DAYS = 30
+SHARE_LINK_OWNER_CACHE_SECONDS = 60
+# Set to e.g. "/protected/" to let nginx stream shared files via X-Accel-Redirect
+SHARE_LINK_ACCEL_REDIRECT = None
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    SHARE_LINK_CACHE: {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(BASE_DIR, "share_link_cache"),
+        # Culling evicts live cap counters, so keep it well above the link count
+        'OPTIONS': {'MAX_ENTRIES': 100000},
+    },
+}
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
@@ -130,6 +189,20 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/5.2/howto/static-files/
 
 STATIC_URL = 'static/'
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+# `manage.py collectstatic` writes content-hashed names plus .gz/.br variants;
+# sip.views.serve_static (or the proxy) serves them with immutable caching.
+# None of that applies while DEBUG = True: {% static %} then emits the
+# unhashed names, which have no .gz/.br variants and get max-age=0.
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'sip.storage.CompressedManifestStaticFilesStorage',
+    },
+}
 
 
 # Default primary key field type
@@ -151,3 +224,10 @@ EMAIL_USE_TLS = True
 EMAIL_HOST_USER = 'ghimireshashank2004@gmail.com'  
 EMAIL_HOST_PASSWORD = 'xalj huea tlvu pxzd'  
 DEFAULT_FROM_EMAIL = 'Zephyr <ghimireshashank2004@gmail.com>'
+EMAIL_TIMEOUT = 20
+
+# landing.outbox: contact-form mail is queued and sent by `manage.py send_outbox`
+OUTBOX_BATCH_SIZE = 50
+OUTBOX_MAX_ATTEMPTS = 6
+OUTBOX_RETRY_SECONDS = 60     # doubled after every failed attempt
+OUTBOX_DEDUP_SECONDS = 600
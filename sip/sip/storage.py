@@ -0,0 +1,53 @@
+# sip/storage.py
+import gzip
+import os
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+try:
+    import brotli
+except ImportError:  # .br variants are skipped without the Brotli package
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = {".css", ".js", ".svg", ".html", ".json", ".txt", ".map", ".xml"}
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Content-hashed static files (app.3f2a9c1b7d0e.css) plus .gz and .br
+    siblings written at collectstatic time, so nothing is compressed per
+    request. sip.views.serve_static picks the variant for Accept-Encoding.
+    """
+
+    # Without collectstatic (tests, a fresh checkout with DEBUG off) there is
+    # no manifest; link the plain names instead of failing every page
+    manifest_strict = False
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            # Not in the manifest and not collected either, so it can't be hashed
+            return name
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for name in self.hashed_files.values():
+            if os.path.splitext(name)[1] in COMPRESSIBLE_EXTENSIONS:
+                self.compress(name)
+
+    def compress(self, name):
+        path = self.path(name)
+        with open(path, "rb") as f:
+            data = f.read()
+
+        variants = [(".gz", gzip.compress(data, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            variants.append((".br", brotli.compress(data, quality=11)))
+        for suffix, compressed in variants:
+            # Not worth it for tiny files that barely shrink
+            if len(compressed) < len(data) * 0.95:
+                with open(path + suffix, "wb") as f:
+                    f.write(compressed)
@@ -0,0 +1,118 @@
+import gzip
+import os
+import shutil
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from .storage import CompressedManifestStaticFilesStorage, brotli
+from .views import accepted_encodings, serve_static
+
+HASHED = "css/app.0123456789ab.css"
+
+
+class AcceptedEncodingsTests(SimpleTestCase):
+    def test_parses_codings(self):
+        self.assertEqual(accepted_encodings("gzip, deflate, br"), {"gzip", "deflate", "br"})
+        self.assertEqual(accepted_encodings("BR;q=0.8 , gzip;q=1"), {"br", "gzip"})
+        self.assertEqual(accepted_encodings(""), {""})
+
+    def test_q_zero_is_excluded(self):
+        self.assertEqual(accepted_encodings("br;q=0, gzip"), {"gzip"})
+        self.assertEqual(accepted_encodings("br; q=0.000, gzip;q=0.0"), set())
+
+
+class ServeStaticTests(SimpleTestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        os.makedirs(os.path.join(self.root, "css"))
+        for name, content in [
+            (HASHED, b"plain"), (HASHED + ".gz", b"gzipped"), (HASHED + ".br", b"brotli"),
+            ("css/app.css", b"unhashed"),
+        ]:
+            with open(os.path.join(self.root, name), "wb") as f:
+                f.write(content)
+        static_settings = override_settings(STATIC_ROOT=self.root)
+        static_settings.enable()
+        self.addCleanup(static_settings.disable)
+
+    def get(self, path, accept_encoding=None):
+        headers = {"HTTP_ACCEPT_ENCODING": accept_encoding} if accept_encoding is not None else {}
+        response = serve_static(RequestFactory().get("/static/" + path, **headers), path)
+        self.addCleanup(response.close)
+        return response, b"".join(response.streaming_content)
+
+    def test_brotli_preferred_over_gzip(self):
+        response, body = self.get(HASHED, "gzip, br")
+
+        self.assertEqual((response["Content-Encoding"], body), ("br", b"brotli"))
+        self.assertEqual(response["Content-Type"], "text/css")
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+
+    def test_gzip_when_brotli_not_accepted(self):
+        response, body = self.get(HASHED, "gzip, br;q=0")
+
+        self.assertEqual((response["Content-Encoding"], body), ("gzip", b"gzipped"))
+
+    def test_identity_without_accept_encoding(self):
+        response, body = self.get(HASHED)
+
+        self.assertNotIn("Content-Encoding", response)
+        self.assertEqual(body, b"plain")
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+
+    def test_cache_control(self):
+        self.assertEqual(self.get(HASHED)[0]["Cache-Control"], "public, max-age=31536000, immutable")
+        self.assertEqual(self.get("css/app.css")[0]["Cache-Control"], "public, max-age=0, must-revalidate")
+
+    def test_no_content_disposition(self):
+        response, _ = self.get(HASHED, "br")
+
+        self.assertNotIn("Content-Disposition", response)
+
+    def test_missing_and_outside_files_404(self):
+        from django.http import Http404
+
+        for path in ["css/missing.css", "../settings.py"]:
+            with self.assertRaises(Http404, msg=path):
+                serve_static(RequestFactory().get("/static/" + path), path)
+
+
+class CompressedStorageTests(SimpleTestCase):
+    def setUp(self):
+        self.source = tempfile.mkdtemp()
+        self.target = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.source, ignore_errors=True)
+        self.addCleanup(shutil.rmtree, self.target, ignore_errors=True)
+
+    def test_post_process_writes_compressed_siblings(self):
+        data = b"body { color: #123456; margin: 0 auto; }\n" * 200
+        with open(os.path.join(self.source, "app.css"), "wb") as f:
+            f.write(data)
+        with open(os.path.join(self.source, "logo.png"), "wb") as f:
+            f.write(b"\x89PNG" * 500)
+        storage = CompressedManifestStaticFilesStorage(location=self.target)
+        source = FileSystemStorage(location=self.source)
+
+        list(storage.post_process({name: (source, name) for name in ["app.css", "logo.png"]}))
+
+        hashed = storage.path(storage.hashed_files["app.css"])
+        self.assertNotEqual(os.path.basename(hashed), "app.css")
+        with open(hashed + ".gz", "rb") as f:
+            self.assertEqual(gzip.decompress(f.read()), data)
+        if brotli is not None:
+            with open(hashed + ".br", "rb") as f:
+                self.assertEqual(brotli.decompress(f.read()), data)
+        # Only text formats are compressed
+        self.assertFalse(os.path.exists(storage.path(storage.hashed_files["logo.png"]) + ".gz"))
+
+
+class UncollectedStaticTests(TestCase):
+    def test_pages_render_before_collectstatic(self):
+        with tempfile.TemporaryDirectory() as empty, override_settings(STATIC_ROOT=empty):
+            response = self.client.get(reverse("landing_page"))
+
+        self.assertEqual(response.status_code, 200)
@@ -1,8 +1,11 @@
 # sip/urls.py
 from django.contrib import admin
-from django.urls import path, include # Import include
+from django.conf import settings
+from django.urls import path, re_path, include # Import include
 from django.shortcuts import redirect
 
+from . import views
+
 urlpatterns = [
     # Option 1: If you want / to directly show the landing page content (requires landing/urls.py to have path('', ...))
     # In this case, remove the redirect from here and let landing handle the root.
@@ -17,4 +20,6 @@ urlpatterns = [
     path('', include('clients.urls')), # This looks for clients/urls.py
     # Keep the admin URLs
     path('admin/', admin.site.urls),
+    # Collected static files; with DEBUG on, runserver serves them itself
+    re_path(r'^%s(?P<path>.*)$' % settings.STATIC_URL.lstrip('/'), views.serve_static),
 ]
\ No newline at end of file
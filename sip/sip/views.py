@@ -0,0 +1,58 @@
+# sip/views.py
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404
+from django.utils._os import safe_join
+
+# ManifestStaticFilesStorage names look like "css/app.3f2a9c1b7d0e.css"
+HASHED_NAME = re.compile(r"\.[0-9a-f]{12}\.[^./]+$")
+ENCODINGS = [("br", ".br"), ("gzip", ".gz")]
+
+
+def accepted_encodings(header):
+    """Codings from an Accept-Encoding header, ignoring any with q=0."""
+    accepted = set()
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+def serve_static(request, path):
+    """
+    Serve collected static files when no front proxy does it: precompressed
+    variant by Accept-Encoding, and a one-year immutable cache for hashed names.
+    """
+    try:
+        full_path = safe_join(settings.STATIC_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404
+    if not os.path.isfile(full_path):
+        raise Http404
+
+    content_type = mimetypes.guess_type(full_path)[0] or "application/octet-stream"
+    accepted = accepted_encodings(request.headers.get("Accept-Encoding", ""))
+    serve_path, encoding = full_path, None
+    for coding, suffix in ENCODINGS:
+        if coding in accepted and os.path.isfile(full_path + suffix):
+            serve_path, encoding = full_path + suffix, coding
+            break
+
+    response = FileResponse(open(serve_path, "rb"), content_type=content_type)
+    # FileResponse names the file it was given ("app.<hash>.css.br"); assets are
+    # never downloads, so drop the header rather than leak the variant's name
+    del response["Content-Disposition"]
+    if encoding:
+        response["Content-Encoding"] = encoding
+    response["Vary"] = "Accept-Encoding"
+    if HASHED_NAME.search(path):
+        response["Cache-Control"] = "public, max-age=31536000, immutable"
+    else:
+        response["Cache-Control"] = "public, max-age=0, must-revalidate"
+    return response